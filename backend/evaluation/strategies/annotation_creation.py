@@ -3,6 +3,7 @@ from tqdm import tqdm
 import logging
 import os
 from evaluation.strategy import EvaluationStrategy
+from fashion_search.data_handling.catalog import load_catalog
 
 class AnnotationCreationStrategy(EvaluationStrategy):
     def _get_image_path(self, article_id: int) -> str:
@@ -16,7 +17,7 @@ class AnnotationCreationStrategy(EvaluationStrategy):
         logging.info("🚀 EXECUTING STRATEGY: Annotation File Creation...")
         with open(self.config.QUERIES_FILE_PATH, 'r') as f:
             queries = [line.strip() for line in f if line.strip()]
-        articles_df = pd.read_csv(self.config.COMPLETE_ARTICLES_CSV_PATH, dtype={'article_id': int})
+        articles_df = load_catalog(columns=['article_id', 'prod_name', 'detail_desc']).astype({'article_id': int})
 
         records = []
         seen_pairs = set()
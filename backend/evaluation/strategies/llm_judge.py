@@ -4,6 +4,7 @@ import logging
 import json
 import ollama
 from evaluation.strategy import EvaluationStrategy
+from fashion_search.data_handling.catalog import load_catalog
 
 class LlmJudgeStrategy(EvaluationStrategy):
     def _load_prompt(self, prompt_path: str) -> str:
@@ -41,7 +42,7 @@ class LlmJudgeStrategy(EvaluationStrategy):
         logging.info("🚀 EXECUTING STRATEGY: LLM-as-a-Judge A/B Evaluation...")
 
         prompt_template = self._load_prompt(self.config.PROMPTS_DIR / "llm_judge_prompt.txt")
-        articles_df = pd.read_csv(self.config.COMPLETE_ARTICLES_CSV_PATH)
+        articles_df = load_catalog(columns=['article_id', 'prod_name']).astype({'article_id': int})
         with open(self.config.QUERIES_FILE_PATH, 'r') as f:
             queries = [line.strip() for line in f if line.strip()]
 
@@ -0,0 +1,78 @@
+# scripts/benchmark_captioning.py
+
+import argparse
+import os
+import time
+from collections import Counter
+import pandas as pd
+
+from src.fashion_search.core.config import settings
+from src.fashion_search.captioning.captioning_pipeline import CAPTIONING_PROFILES, CaptioningPipeline
+from src.fashion_search.data_handling.catalog import load_catalog
+from src.fashion_search.data_handling.dataloader import create_image_dataloader
+
+REFERENCE_PROFILE = "quality"
+
+
+def token_f1(candidate: str, reference: str) -> float:
+    candidate_tokens, reference_tokens = candidate.lower().split(), reference.lower().split()
+    overlap = sum((Counter(candidate_tokens) & Counter(reference_tokens)).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(candidate_tokens), overlap / len(reference_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
+def sample_articles(num_images: int) -> pd.DataFrame:
+    df = load_catalog(columns=["article_id"])
+    padded_ids = df["article_id"].str.zfill(10)
+    has_image = [
+        os.path.exists(os.path.join(settings.IMAGE_BASE_DIR, padded_id[:3], f"{padded_id}.jpg"))
+        for padded_id in padded_ids
+    ]
+    return df[has_image].head(num_images)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BLIP captioning profiles on speed and agreement with beam search.")
+    parser.add_argument("--profiles", nargs="+", default=list(CAPTIONING_PROFILES), choices=list(CAPTIONING_PROFILES))
+    parser.add_argument("--num-images", type=int, default=256)
+    args = parser.parse_args()
+
+    profiles = [REFERENCE_PROFILE] + [profile for profile in args.profiles if profile != REFERENCE_PROFILE]
+    articles = sample_articles(args.num_images)
+    print(f"🖼️ Benchmarking {len(profiles)} profiles on {len(articles)} images...")
+
+    captions_by_profile, rows = {}, []
+    for profile in profiles:
+        pipeline = CaptioningPipeline(profile=profile)
+        batches = list(create_image_dataloader(pipeline._create_dataset(articles)))
+
+        start = time.perf_counter()
+        captions = {}
+        for pixel_values, article_ids in batches:
+            captions.update(pipeline.caption_batch(pixel_values, article_ids))
+        elapsed = time.perf_counter() - start
+        captions_by_profile[profile] = captions
+
+        reference = captions_by_profile[REFERENCE_PROFILE]
+        shared_ids = [article_id for article_id in captions if article_id in reference]
+        rows.append({
+            "profile": profile,
+            "images_per_s": len(captions) / elapsed,
+            "token_f1_vs_quality": sum(token_f1(captions[i], reference[i]) for i in shared_ids) / max(len(shared_ids), 1),
+            "exact_match_vs_quality": sum(captions[i] == reference[i] for i in shared_ids) / max(len(shared_ids), 1),
+            "failed": len(articles) - len(captions),
+        })
+
+    results_df = pd.DataFrame(rows)
+    print("\n" + results_df.to_string(index=False, float_format="%.4f"))
+
+    settings.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = settings.REPORTS_DIR / "captioning_profiles.csv"
+    results_df.to_csv(output_path, index=False)
+    print(f"📊 Report saved successfully to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# scripts/benchmark_redis_codecs.py
+
+import argparse
+import json
+import time
+import pandas as pd
+
+from src.fashion_search.core.config import settings
+from src.fashion_search.data_handling.catalog import load_catalog
+from src.fashion_search.redis_client.codec import COMPRESSOR_IDS, SERIALIZER_IDS, PayloadCodec
+from src.fashion_search.services.article_cache import ARTICLE_DISPLAY_FIELDS
+
+
+def load_payloads(num_articles: int, hits_per_query: int) -> dict[str, list]:
+    df = load_catalog().head(num_articles).fillna("")
+    articles = df.to_dict(orient="records")
+    slim_articles = df[[column for column in ARTICLE_DISPLAY_FIELDS if column in df.columns]].to_dict(orient="records")
+    search_results = [
+        {"transformed_query": "query", "summary": "summary", "milvus_results": articles[i:i + hits_per_query]}
+        for i in range(0, len(articles), hits_per_query)
+    ]
+    return {"article_full": articles, "article_slim": slim_articles, "search_cache": search_results}
+
+
+def measure(codec: PayloadCodec | None, payloads: list) -> dict:
+    encode = codec.encode if codec else (lambda obj: json.dumps(obj).encode("utf-8"))
+    decode = codec.decode if codec else json.loads
+
+    start = time.perf_counter()
+    encoded = [encode(payload) for payload in payloads]
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for raw in encoded:
+        decode(raw)
+    decode_seconds = time.perf_counter() - start
+
+    return {
+        "avg_bytes": sum(map(len, encoded)) / len(encoded),
+        "encode_us": encode_seconds / len(encoded) * 1e6,
+        "decode_us": decode_seconds / len(encoded) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Redis payload codecs on size and encode/decode time.")
+    parser.add_argument("--num-articles", type=int, default=5000)
+    parser.add_argument("--hits-per-query", type=int, default=40)
+    args = parser.parse_args()
+
+    rows = []
+    for payload_name, payloads in load_payloads(args.num_articles, args.hits_per_query).items():
+        rows.append({"payload": payload_name, "codec": "legacy json text", **measure(None, payloads)})
+        for serializer in SERIALIZER_IDS:
+            for compression in COMPRESSOR_IDS:
+                try:
+                    codec = PayloadCodec(serializer, compression)
+                except Exception as e:
+                    print(f"⚠️ Skipping {serializer}+{compression}: {e}")
+                    continue
+                if codec.serializer != serializer or codec.compression != compression:
+                    continue
+                rows.append({"payload": payload_name, "codec": codec.tag, **measure(codec, payloads)})
+
+    results_df = pd.DataFrame(rows)
+    print("\n" + results_df.to_string(index=False, float_format="%.1f"))
+
+    settings.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = settings.REPORTS_DIR / "redis_codecs.csv"
+    results_df.to_csv(output_path, index=False)
+    print(f"📊 Report saved successfully to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# scripts/benchmark_text_encoder.py
+
+import argparse
+import time
+import pandas as pd
+
+from src.fashion_search.core.config import settings
+from src.fashion_search.core.model_loader import load_clip_model_and_processor
+from src.fashion_search.data_handling.catalog import load_catalog
+from src.fashion_search.embeddings.embedding_utils import embed_text_queries
+from src.fashion_search.embeddings.text_encoder import (
+    TEXT_ENCODER_BACKENDS,
+    PARITY_TEXTS,
+    build_text_encoder,
+    check_parity,
+)
+
+
+def load_benchmark_texts(num_texts: int) -> list[str]:
+    df = load_catalog(columns=["prod_name", "detail_desc"]).head(num_texts)
+    return (df["prod_name"].fillna("") + " " + df["detail_desc"].fillna("")).str.strip().tolist()
+
+
+def time_per_call(encoder, processor, texts: list[str], batch_size: int, repeats: int) -> float:
+    embed_text_queries(encoder, processor, texts[:batch_size])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for i in range(0, len(texts), batch_size):
+            embed_text_queries(encoder, processor, texts[i:i + batch_size])
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CLIP text encoder backends on latency, throughput and parity.")
+    parser.add_argument("--backends", nargs="+", default=list(TEXT_ENCODER_BACKENDS), choices=list(TEXT_ENCODER_BACKENDS))
+    parser.add_argument("--num-texts", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--num-queries", type=int, default=50)
+    args = parser.parse_args()
+
+    model, processor = load_clip_model_and_processor()
+    catalog_texts = load_benchmark_texts(args.num_texts)
+    query_texts = (PARITY_TEXTS * (args.num_queries // len(PARITY_TEXTS) + 1))[:args.num_queries]
+
+    rows = []
+    for backend in args.backends:
+        try:
+            encoder = build_text_encoder(model, processor, backend)
+        except Exception as e:
+            print(f"⚠️ Skipping backend '{backend}': {e}")
+            continue
+
+        print(f"⏱️ Benchmarking '{backend}'...")
+        query_seconds = time_per_call(encoder, processor, query_texts, batch_size=1, repeats=1)
+        catalog_seconds = time_per_call(encoder, processor, catalog_texts, batch_size=args.batch_size, repeats=1)
+        rows.append({
+            "backend": backend,
+            "query_ms": query_seconds / len(query_texts) * 1000,
+            "texts_per_s": len(catalog_texts) / catalog_seconds,
+            "min_cosine": check_parity(model, encoder, processor, catalog_texts[:256]),
+        })
+
+    results_df = pd.DataFrame(rows)
+    print("\n" + results_df.to_string(index=False, float_format="%.4f"))
+
+    settings.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = settings.REPORTS_DIR / "text_encoder_benchmark.csv"
+    results_df.to_csv(output_path, index=False)
+    print(f"📊 Report saved successfully to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# scripts/build_image_cache.py
+
+import argparse
+
+from src.fashion_search.core.config import settings
+from src.fashion_search.data_handling.catalog import read_articles_csv
+from src.fashion_search.data_handling.image_cache import build_image_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-decode article images into a memory-mapped uint8 tensor cache.")
+    parser.add_argument("--image-size", type=int, default=settings.IMAGE_CACHE_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_CACHE_WORKERS)
+    args = parser.parse_args()
+
+    articles = read_articles_csv(settings.ARTICLES_CSV_PATH, columns=["article_id"])
+    build_image_cache(articles["article_id"], image_size=args.image_size, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
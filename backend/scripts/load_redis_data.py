@@ -1,45 +1,104 @@
 # scripts/load_redis_data.py
 
 import sys
+import time
+import argparse
 from pathlib import Path
 import pandas as pd
 import redis
-import json
 from tqdm import tqdm
 from src.fashion_search.core.config import settings
+from src.fashion_search.data_handling.catalog import load_catalog
+from src.fashion_search.data_handling.manifest import fingerprint_records
+from src.fashion_search.redis_client.codec import PayloadCodec
+from src.fashion_search.services.article_cache import ARTICLE_DISPLAY_FIELDS
+from src.fashion_search.services.index_generation import REVISION_KEY
 
 project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
 
-def load_data_to_redis():
+FINGERPRINTS_KEY = "articles:fingerprints"
+
+
+def serialize_articles(df: pd.DataFrame, codec: PayloadCodec) -> pd.Series:
+    df = df.fillna("")
+    padded_ids = df["article_id"].astype(str).str.zfill(10)
+    df = df.assign(image_path=padded_ids.str[:3] + "/" + padded_ids + ".jpg")
+    if codec.accepts_json:
+        json_lines = df.to_json(orient="records", lines=True, force_ascii=False, double_precision=15)
+        lines = json_lines.rstrip("\n").split("\n") if len(df) else []
+        records = [codec.encode_json(line.encode("utf-8")) for line in lines]
+    else:
+        records = [codec.encode(record) for record in df.to_dict(orient="records")]
+    return pd.Series(records, index="article:" + df["article_id"].astype(str))
+
+
+def write_chunks(r: redis.Redis, df: pd.DataFrame, fingerprints: pd.Series, codec: PayloadCodec, chunk_size: int) -> int:
+    written_bytes = 0
+    for start in tqdm(range(0, len(df), chunk_size), desc="Uploading to Redis"):
+        chunk = serialize_articles(df.iloc[start:start + chunk_size], codec)
+        pipe = r.pipeline(transaction=False)
+        pipe.mset(chunk.to_dict())
+        pipe.hset(FINGERPRINTS_KEY, mapping=fingerprints.iloc[start:start + chunk_size].to_dict())
+        pipe.execute()
+        written_bytes += chunk.map(len).sum()
+    return written_bytes
+
+
+def delete_chunks(r: redis.Redis, keys: list[str], chunk_size: int):
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(*chunk)
+        pipe.hdel(FINGERPRINTS_KEY, *chunk)
+        pipe.execute()
+
+
+def load_data_to_redis(full: bool = False, chunk_size: int = settings.REDIS_LOAD_CHUNK_SIZE,
+                       record_fields: str = settings.ARTICLE_RECORD_FIELDS):
     print("🚀 Starting data load into Redis...")
     try:
-        r = redis.Redis(host=settings.REDIS_HOST, port=int(settings.REDIS_PORT))
-        df = pd.read_csv(settings.COMPLETE_ARTICLES_CSV_PATH, dtype={"article_id": str})
-        df.fillna("", inplace=True)
+        r = redis.Redis(host=settings.REDIS_HOST, port=int(settings.REDIS_PORT), decode_responses=True)
+        r.ping()
+        df = load_catalog(columns=ARTICLE_DISPLAY_FIELDS if record_fields == "slim" else None)
+        codec = PayloadCodec()
     except Exception as e:
         print(f"❌ Failed during setup: {e}")
         return
 
-    print("⏳ Loading article data into Redis with standardized keys and paths...")
-    pipe = r.pipeline()
-    for _, row in tqdm(df.iterrows(), total=df.shape[0], desc="Uploading to Redis"):
-        value = row.to_dict()
-        article_id_str = str(value["article_id"])
-
-        padded_id = article_id_str.zfill(10)
+    start_time = time.perf_counter()
+    record_format = f"{codec.tag}.{record_fields}"
+    fingerprints = pd.Series(
+        [f"{record_format}:{fingerprint}" for fingerprint in fingerprint_records(df, df.columns.tolist())],
+        index="article:" + df["article_id"].astype(str),
+    )
+    stored = pd.Series(r.hgetall(FINGERPRINTS_KEY), dtype=object)
+    changed = pd.Series(True, index=fingerprints.index) if full else fingerprints.ne(stored.reindex(fingerprints.index))
+    stale = stored.index.difference(fingerprints.index).tolist()
+    written = int(changed.sum())
+    print(f"🧾 Fingerprinted {len(df)} {record_fields} articles as {codec.tag} in {time.perf_counter() - start_time:.2f}s")
 
-        key = f"article:{article_id_str}"
+    mode = "full load" if full else "incremental sync"
+    print(f"⏳ {mode}: writing {written} articles and deleting {len(stale)} in chunks of {chunk_size}...")
+    start_time = time.perf_counter()
+    written_bytes = write_chunks(r, df[changed.to_numpy()], fingerprints[changed.to_numpy()], codec, chunk_size)
+    delete_chunks(r, stale, chunk_size)
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
 
-        value["image_path"] = f"{padded_id[:3]}/{padded_id}.jpg"
+    if written or stale:
+        r.incr(REVISION_KEY)
+    print(f"✅ Redis now holds {len(df)} articles ({written / elapsed:.0f} articles/sec written, "
+          f"{written_bytes / 1e6:.1f} MB encoded, {len(df) - written} unchanged).")
 
-        json_value = json.dumps(value)
-        pipe.set(key, json_value)
 
-    print("⏳ Executing Redis pipeline...")
-    pipe.execute()
-    print(f"✅ Successfully loaded {len(df)} articles into Redis.")
+def main():
+    parser = argparse.ArgumentParser(description="Load the article catalog into Redis.")
+    parser.add_argument("--full", action="store_true", help="Rewrite every article instead of only new or changed ones.")
+    parser.add_argument("--chunk-size", type=int, default=settings.REDIS_LOAD_CHUNK_SIZE)
+    parser.add_argument("--record-fields", choices=["full", "slim"], default=settings.ARTICLE_RECORD_FIELDS)
+    args = parser.parse_args()
+    load_data_to_redis(full=args.full, chunk_size=args.chunk_size, record_fields=args.record_fields)
 
 
 if __name__ == "__main__":
-    load_data_to_redis()
+    main()
@@ -39,23 +39,12 @@ else
     sleep 5
 fi
 
-# --- Check and Load Redis Data ---
-echo "🔍 Checking for data in Redis..."
-KEY_COUNT=$(docker exec $REDIS_CONTAINER_NAME redis-cli DBSIZE)
-
-if [ "$KEY_COUNT" -eq 0 ]; then
-    echo " Redis is empty. Loading data from CSV..."
-    
-    # --- THIS IS THE FIX ---
-    # Set PYTHONPATH to the project root so Python can find the 'src' module.
-    # Then run the script as a module (-m) which is more robust.
-    export PYTHONPATH="$PROJECT_ROOT"
-    python -m scripts.load_redis_data
-    # ----------------------
-
-else
-    echo "✅ Redis already contains $KEY_COUNT keys. Skipping data load."
-fi
+# --- Sync Redis Data ---
+# The loader only writes articles that are new or changed since the last run,
+# so it is cheap to run on every start.
+echo "🔄 Syncing article data into Redis..."
+export PYTHONPATH="$PROJECT_ROOT"
+python -m scripts.load_redis_data
 
 # --- Milvus Vector Database ---
 echo "🚀 Starting Milvus..."
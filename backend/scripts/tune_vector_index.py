@@ -0,0 +1,138 @@
+# scripts/tune_vector_index.py
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from src.fashion_search.core.config import settings
+from src.fashion_search.milvus_client.vector_db_client import VectorDBClient
+from src.fashion_search.data_handling.embedding_store import load_embeddings
+from src.fashion_search.data_handling.catalog import load_catalog
+
+TUNING_COLLECTION = "articles_index_tuning"
+
+SEARCH_PARAM_SWEEPS = {
+    "IVF_FLAT": ("nprobe", [4, 8, 16, 32, 64, 128]),
+    "IVF_SQ8": ("nprobe", [4, 8, 16, 32, 64, 128]),
+    "IVF_PQ": ("nprobe", [4, 8, 16, 32, 64, 128]),
+    "HNSW": ("ef", [16, 32, 64, 128, 256]),
+}
+
+
+def load_catalog_vectors(columns: list[str]) -> tuple[pd.DataFrame, np.ndarray]:
+    article_ids, embeddings = load_embeddings()
+    embeddings = np.array(embeddings, dtype=np.float32)
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    df = load_catalog(columns=columns)
+    df = df.drop_duplicates("article_id").set_index("article_id").loc[article_ids].reset_index()
+    return df, embeddings
+
+
+def exact_ground_truth(embeddings: np.ndarray, queries: np.ndarray, top_k: int) -> np.ndarray:
+    scores = queries @ embeddings.T
+    top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    return np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+
+
+def sweep_index_type(
+    client: VectorDBClient,
+    index_type: str,
+    df: pd.DataFrame,
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    ground_truth_ids: list[set],
+    top_k: int,
+) -> list[dict]:
+    preset = settings.MILVUS_INDEX_PRESETS[index_type]
+    param_name, param_values = SEARCH_PARAM_SWEEPS[index_type]
+
+    client.set_index_config(index_type, preset["index_params"], preset["search_params"])
+    client.set_collection(TUNING_COLLECTION, recreate=True)
+    client.insert(df.copy(), embeddings)
+
+    build_start = time.perf_counter()
+    client.create_index()
+    build_seconds = time.perf_counter() - build_start
+
+    rows = []
+    for value in param_values:
+        if param_name == "ef" and value < top_k:
+            continue
+        client.search_params = {**preset["search_params"], param_name: value}
+
+        latencies_ms, matches = [], 0
+        for query, expected_ids in tqdm(zip(queries, ground_truth_ids), total=len(queries), desc=f"{index_type} {param_name}={value}"):
+            start = time.perf_counter()
+            hits = client.search_batch([query.tolist()], top_k=top_k)[0]
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            matches += len(expected_ids.intersection(hit["article_id"] for hit in hits))
+
+        rows.append({
+            "index_type": index_type,
+            "index_params": preset["index_params"],
+            "search_param": f"{param_name}={value}",
+            f"recall@{top_k}": matches / (len(queries) * top_k),
+            "p50_ms": float(np.percentile(latencies_ms, 50)),
+            "p99_ms": float(np.percentile(latencies_ms, 99)),
+            "build_s": build_seconds,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Milvus index types and search params for recall vs latency.")
+    parser.add_argument("--index-types", nargs="+", default=list(SEARCH_PARAM_SWEEPS), choices=list(SEARCH_PARAM_SWEEPS))
+    parser.add_argument("--top-k", type=int, default=settings.EVALUATION_K)
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--recall-target", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    client = VectorDBClient(host=settings.MILVUS_HOST, port=settings.MILVUS_PORT)
+
+    print("📥 Loading catalog vectors...")
+    df, embeddings = load_catalog_vectors(client.scalar_field_names)
+
+    rng = np.random.default_rng(args.seed)
+    query_rows = rng.choice(len(embeddings), size=min(args.num_queries, len(embeddings)), replace=False)
+    queries = embeddings[query_rows]
+
+    print(f"🎯 Computing exact top-{args.top_k} ground truth for {len(queries)} queries...")
+    ground_truth = exact_ground_truth(embeddings, queries, args.top_k)
+    article_ids = df["article_id"].to_numpy()
+    ground_truth_ids = [set(article_ids[row]) for row in ground_truth]
+
+    results = []
+    try:
+        for index_type in args.index_types:
+            results.extend(sweep_index_type(client, index_type, df, embeddings, queries, ground_truth_ids, args.top_k))
+    finally:
+        if client.collection is not None:
+            client.collection.drop()
+            print(f"🗑️ Dropped tuning collection '{TUNING_COLLECTION}'")
+        client._router_path(TUNING_COLLECTION).unlink(missing_ok=True)
+
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False, float_format="%.4f"))
+
+    settings.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = settings.REPORTS_DIR / "vector_index_tuning.csv"
+    results_df.to_csv(output_path, index=False)
+    print(f"📊 Report saved successfully to: {output_path}")
+
+    eligible = results_df[results_df[f"recall@{args.top_k}"] >= args.recall_target]
+    if eligible.empty:
+        print(f"⚠️ No setting reached recall@{args.top_k} >= {args.recall_target}.")
+    else:
+        best = eligible.sort_values("p99_ms").iloc[0]
+        print(
+            f"✅ Fastest setting meeting the target: MILVUS_INDEX_TYPE={best['index_type']} "
+            f"({best['search_param']}) — recall {best[f'recall@{args.top_k}']:.4f}, p99 {best['p99_ms']:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
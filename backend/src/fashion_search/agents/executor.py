@@ -2,7 +2,6 @@ from typing import List, Dict
 from ..schemas.agent_schemas import SearchResult, OutfitPlan
 from ..services.redis_search_service import RedisSearchService
 from ..milvus_client.vector_db_client import VectorDBClient
-from ..embeddings.embedding_utils import embed_text_query
 
 class FashionSearchExecutor:
     def __init__(self, search_service: RedisSearchService):
@@ -21,36 +20,52 @@ class FashionSearchExecutor:
         expression = " and ".join(parts)
         return expression if expression else None
 
-    def search_category(self, plan: OutfitPlan, category: str, description: str, top_k: int = 12) -> List[SearchResult]:
-        try:
-            filter_expr = self._build_filter_expression(plan.filters)
-            
-            print(f"🔍 Searching {category}: '{description}' with filter: {filter_expr}")
+    def _search_hits(self, descriptions: List[str], filter_expr: str | None, top_k: int) -> List[List[dict]]:
+        query_embeddings = self.search_service.embedder.embed_many(descriptions)
+        return self.db_client.search_batch(
+            vectors=query_embeddings,
+            top_k=top_k,
+            filter_expressions=filter_expr
+        )
 
-            query_embedding = embed_text_query(
-                model=self.search_service.model,
-                processor=self.search_service.processor,
-                text=description
-            )
-            
-            milvus_hits = self.db_client.search(
-                vectors=[query_embedding], 
-                top_k=top_k, 
-                filter_expression=filter_expr
-            )
-
-            search_results = [
-                SearchResult(
-                    article_id=str(hit.get("article_id")),
-                    score=hit.get("score", 0.0),
-                    category=category,
-                )
-                for hit in milvus_hits
-            ]
-
-            print(f"✅ Found {len(search_results)} {category} items")
-            return search_results
+    def search_categories(self, plan: OutfitPlan, categories: List[str], descriptions: List[str], top_k: int = 12) -> List[SearchResult]:
+        if not categories:
+            return []
+
+        filter_expr = self._build_filter_expression(plan.filters)
+        for category, description in zip(categories, descriptions):
+            print(f"🔍 Searching {category}: '{description}' with filter: {filter_expr}")
 
+        try:
+            milvus_hits_per_category = self._search_hits(descriptions, filter_expr, top_k)
         except Exception as e:
-            print(f"❌ Search failed for {category}: {e}")
-            return []
\ No newline at end of file
+            print(f"⚠️ Batched search failed for {', '.join(categories)}: {e}. Searching categories one by one.")
+            milvus_hits_per_category = []
+            for category, description in zip(categories, descriptions):
+                try:
+                    milvus_hits_per_category.extend(self._search_hits([description], filter_expr, top_k))
+                except Exception as e:
+                    print(f"❌ Search failed for {category}: {e}")
+                    milvus_hits_per_category.append([])
+
+        search_results = []
+        for category, milvus_hits in zip(categories, milvus_hits_per_category):
+            try:
+                category_results = [
+                    SearchResult(
+                        article_id=str(hit.get("article_id")),
+                        score=hit.get("score", 0.0),
+                        category=category,
+                    )
+                    for hit in milvus_hits
+                ]
+            except Exception as e:
+                print(f"❌ Could not read {category} results: {e}")
+                continue
+            search_results.extend(category_results)
+            print(f"✅ Found {len(category_results)} {category} items")
+
+        return search_results
+
+    def search_category(self, plan: OutfitPlan, category: str, description: str, top_k: int = 12) -> List[SearchResult]:
+        return self.search_categories(plan, [category], [description], top_k=top_k)
@@ -28,11 +28,11 @@ class MultiFashionAgent:
             
             print(f"📋 Plan: {len(plan.categories)} categories, single_item={plan.is_single_item}, filters={plan.filters}")
 
-            all_results = []
-            for i, category in enumerate(plan.categories):
-                description = plan.descriptions[i] if i < len(plan.descriptions) else f"{query} {category}"
-                results = self.executor.search_category(plan, category, description)
-                all_results.extend(results)
+            descriptions = [
+                plan.descriptions[i] if i < len(plan.descriptions) else f"{query} {category}"
+                for i, category in enumerate(plan.categories)
+            ]
+            all_results = self.executor.search_categories(plan, plan.categories, descriptions)
 
             print(f"✅ Total results found: {len(all_results)}")
             formatted_response_obj = self.formatter.format_results(all_results, query)
@@ -5,6 +5,14 @@ from pathlib import Path
 from ..core.config import settings
 
 def enrich_search_results(results: List[Dict[str, Any]], request: Request) -> List[Dict[str, Any]]:
+    article_cache = getattr(request.app.state, "article_cache", None)
+    missing = [item for item in results if "image_path" not in item and item.get("article_id")]
+    if article_cache and missing:
+        records = article_cache.get_many([str(item["article_id"]) for item in missing])
+        for item, record in zip(missing, records):
+            for field, value in (record or {}).items():
+                item.setdefault(field, value)
+
     base_url = str(request.base_url)
     for item in results:
         if 'image_path' in item:
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from ...schemas.api_schemas import PipelineOptions
-from ...pipeline.steps import CleanupStep, CaptioningStep, EmbeddingStep, DbInsertionStep
+from ...pipeline.steps import CleanupStep, CaptioningStep, EmbeddingStep, DbInsertionStep, vector_db_manifest
 from ...milvus_client.vector_db_client import VectorDBClient
+from ...core.config import settings
 
 router = APIRouter(prefix="/pipeline", tags=["Data Processing Pipeline"])
 
 @router.post("/")
 async def run_data_pipeline(options: PipelineOptions, request: Request, background_tasks: BackgroundTasks):
-    if not any(vars(options).values()):
+    selected_steps = {name: value for name, value in vars(options).items() if name.startswith("run_")}
+    if not any(selected_steps.values()):
         raise HTTPException(
             status_code=400,
             detail="No pipeline step was selected."
@@ -22,7 +24,11 @@ async def run_data_pipeline(options: PipelineOptions, request: Request, backgrou
         "run_cleanup": CleanupStep(),
         "run_captioning": CaptioningStep(),
         "run_embeddings": EmbeddingStep(),
-        "run_db_insertion": DbInsertionStep(db_client=db_client),
+        "run_db_insertion": DbInsertionStep(
+            db_client=db_client,
+            incremental=options.incremental_db_insertion or settings.DB_SYNC_MODE == "incremental",
+            index_generation=getattr(request.app.state, "index_generation", None),
+        ),
     }
 
     for option, step in step_map.items():
@@ -33,4 +39,21 @@ async def run_data_pipeline(options: PipelineOptions, request: Request, backgrou
     return {
         "message": "Pipeline tasks have been successfully triggered in the background.",
         "options_received": options.model_dump()
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/rollback/")
+def rollback_vector_index(request: Request):
+    try:
+        db_client: VectorDBClient = request.app.state.db_client
+    except AttributeError:
+        raise HTTPException(status_code=503, detail="Database client not available.")
+
+    restored_version = db_client.rollback("articles")
+    if restored_version is None:
+        raise HTTPException(status_code=409, detail="No previous index version is available for rollback.")
+
+    vector_db_manifest(db_client).clear()
+    if index_generation := getattr(request.app.state, "index_generation", None):
+        index_generation.bump()
+    return {"message": "Vector index rolled back.", "active_version": restored_version}
@@ -4,6 +4,8 @@ from fastapi import APIRouter, HTTPException, Request
 
 from ...agents.orchestrator import MultiFashionAgent
 from ...redis_client.redis_db_client import RedisDBClient
+from ...services.index_generation import IndexGeneration
+from ...services.article_cache import ArticleCache
 from ...schemas.api_schemas import SearchRequest
 from ...api.helpers import enrich_search_results  
 
@@ -17,10 +19,12 @@ def agent_recommendation(request: SearchRequest, http_request: Request):
     try:
         multi_agent: MultiFashionAgent = http_request.app.state.multi_fashion_agent
         redis_client: RedisDBClient = http_request.app.state.redis_client
+        index_generation: IndexGeneration = http_request.app.state.index_generation
+        article_cache: ArticleCache = http_request.app.state.article_cache
     except AttributeError:
         raise HTTPException(status_code=503, detail="A required service is not available.")
 
-    cache_key = f"cache:agent:{request.query.strip().lower()}"
+    cache_key = index_generation.cache_key("agent", request.query.strip().lower())
     if cached_response := redis_client.get_json(cache_key):
         print(f"✅ Agent Cache HIT for query: '{request.query}'")
         return {**cached_response, "source": "agent_cache"}
@@ -36,11 +40,12 @@ def agent_recommendation(request: SearchRequest, http_request: Request):
         final_results = []
         if recommended_articles:
             results_with_details = []
-            for article in recommended_articles:
-                article_id = str(article.get("article_id")).zfill(10)
+            article_ids = [str(article.get("article_id")).zfill(10) for article in recommended_articles]
+            records = article_cache.get_many(article_ids)
+            for article, article_id, item_data in zip(recommended_articles, article_ids, records):
                 score = article.get("relevance_score", 0.0)
-                
-                if item_data := redis_client.get_json(f"article:{article_id}"):
+
+                if item_data:
                     item_data["score"] = score
                     results_with_details.append(item_data)
                 else:
@@ -1,11 +1,15 @@
-import pandas as pd
+import time
 import torch
+from torch import nn
 from tqdm import tqdm
 
 from ..core.config import settings
 from ..core.model_loader import load_captioning_model_and_processor
 from ..data_handling.dataset import ImageDataset
 from ..data_handling.dataloader import create_image_dataloader
+from ..data_handling.catalog import read_articles_csv, write_catalog
+from ..data_handling.manifest import ManifestStore
+from ..data_handling.image_cache import CachedImageDataset, ImageTensorCache, image_fingerprint, image_path_for
 
 GENERATION_CONFIG = {
     "max_length": 50,
@@ -14,60 +18,147 @@ GENERATION_CONFIG = {
     "early_stopping": True,
 }
 
+CAPTIONING_PROFILES = {
+    "quality": {"generation": GENERATION_CONFIG, "int8": False},
+    "small_beam": {"generation": {**GENERATION_CONFIG, "num_beams": 2}, "int8": False},
+    "greedy": {"generation": {"max_length": 50, "num_beams": 1, "repetition_penalty": 1.5}, "int8": False},
+    "int8": {"generation": {"max_length": 50, "num_beams": 1, "repetition_penalty": 1.5}, "int8": True},
+}
+
+
+def _is_out_of_memory(error: Exception) -> bool:
+    return isinstance(error, torch.cuda.OutOfMemoryError) or "out of memory" in str(error).lower()
+
+
 class CaptioningPipeline:
-    def __init__(self):
+    def __init__(self, full_refresh: bool = False, profile: str = settings.CAPTIONING_PROFILE):
+        if profile not in CAPTIONING_PROFILES:
+            raise ValueError(f"Unknown captioning profile '{profile}'. Expected one of {list(CAPTIONING_PROFILES)}.")
         self.device = settings.DEVICE
+        self.profile = profile
+        self.generation_config = CAPTIONING_PROFILES[profile]["generation"]
         self.processor, self.model = load_captioning_model_and_processor()
         self.model.to(self.device).eval()
+        if CAPTIONING_PROFILES[profile]["int8"]:
+            self.model = self._quantize(self.model)
+        self.full_refresh = full_refresh
+        self.batch_limit: int | None = None
+        self.manifest = ManifestStore(settings.MANIFEST_DB_PATH, namespace="captions")
+
+    def _quantize(self, model):
+        if self.device.type != "cpu":
+            print(f"⚠️ int8 captioning is CPU-only; keeping the {self.device.type} model unquantized.")
+            return model
+        print("🗜️ Quantizing BLIP linear layers to int8...")
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+    @staticmethod
+    def _image_fingerprint(padded_id: str) -> str | None:
+        fingerprint = image_fingerprint(image_path_for(padded_id))
+        return f"{settings.IMAGE_CAPTION_MODEL}:{fingerprint}" if fingerprint else None
+
+    def _create_dataset(self, df):
+        cache = ImageTensorCache()
+        if cache.exists() and cache.image_size == self.processor.image_processor.size["height"]:
+            print(f"🗃️ Reading pre-decoded images from {cache.directory}")
+            return CachedImageDataset(df, cache.open(), self.processor)
+        return ImageDataset(df, settings.IMAGE_BASE_DIR, self.processor)
 
-    def _generate_captions(self, dataloader) -> dict:
-        captions_dict = {}
-        print("✍️ Generating image captions...")
+    def caption_batch(self, pixel_values: torch.Tensor, article_ids: list[str]) -> dict[str, str]:
+        if self.batch_limit and len(article_ids) > self.batch_limit:
+            captions = {}
+            for start in range(0, len(article_ids), self.batch_limit):
+                end = start + self.batch_limit
+                captions.update(self.caption_batch(pixel_values[start:end], article_ids[start:end]))
+            return captions
+
+        try:
+            with torch.no_grad():
+                generated_ids = self.model.generate(
+                    pixel_values=pixel_values.to(self.device), **self.generation_config
+                )
+            captions = self.processor.batch_decode(generated_ids, skip_special_tokens=True)
+            return {art_id: caption.strip() for art_id, caption in zip(article_ids, captions)}
+        except Exception as e:
+            if len(article_ids) == 1:
+                print(f"⚠️ Captioning failed for article {article_ids[0]}; it will be retried on the next run: {e}")
+                return {}
+            if _is_out_of_memory(e):
+                self.batch_limit = len(article_ids) // 2
+                if self.device.type == "cuda":
+                    torch.cuda.empty_cache()
+                print(f"⚠️ Out of memory on a batch of {len(article_ids)}; capping batches at {self.batch_limit}.")
+            else:
+                print(f"⚠️ A batch of {len(article_ids)} failed ({e}); retrying it in halves.")
+
+        middle = len(article_ids) // 2
+        return {
+            **self.caption_batch(pixel_values[:middle], article_ids[:middle]),
+            **self.caption_batch(pixel_values[middle:], article_ids[middle:]),
+        }
+
+    def _generate_captions(self, dataloader, fingerprints: dict[str, str]) -> int:
+        captioned = 0
+        start_time = time.perf_counter()
+        print(f"✍️ Generating image captions with the '{self.profile}' profile...")
 
         for pixel_values, article_ids in tqdm(dataloader, desc="Captioning Batches"):
-            pixel_values = pixel_values.to(self.device)
-
-            try:
-                with torch.no_grad():
-                    generated_ids = self.model.generate(
-                        pixel_values=pixel_values, **GENERATION_CONFIG
-                    )
-                
-                captions = self.processor.batch_decode(generated_ids, skip_special_tokens=True)
-                
-                for art_id, caption in zip(article_ids, captions):
-                    captions_dict[art_id] = caption.strip()
-            except Exception as e:
-                print(f"⚠️ A batch failed during captioning: {e}")
-                for art_id in article_ids:
-                    captions_dict[art_id] = "caption_generation_failed"
-                    
-        return captions_dict
+            captions = self.caption_batch(pixel_values, article_ids)
+            self.manifest.upsert_many(
+                (art_id, fingerprints[art_id], caption) for art_id, caption in captions.items()
+            )
+            captioned += len(captions)
+
+        elapsed = max(time.perf_counter() - start_time, 1e-9)
+        print(f"   - Captioned {captioned} images at {captioned / elapsed:.2f} images/sec")
+        return captioned
 
     def run(self) -> dict:
         print("--- 🏃 Running Captioning Pipeline ---")
         try:
-            df = pd.read_csv(settings.ARTICLES_CSV_PATH, dtype={'article_id': str})
+            df = read_articles_csv(settings.ARTICLES_CSV_PATH)
         except FileNotFoundError:
             print(f"❌ Error: Raw articles file not found at {settings.ARTICLES_CSV_PATH}")
             return {"status": "failed", "error": "articles.csv not found"}
 
-        dataset = ImageDataset(df, settings.IMAGE_BASE_DIR, self.processor)
-        dataloader = create_image_dataloader(dataset)
-        
-        captions_dict = self._generate_captions(dataloader)
+        if self.full_refresh:
+            self.manifest.clear()
+
+        padded_ids = df["article_id"].str.zfill(10)
+        fingerprints = {padded_id: self._image_fingerprint(padded_id) for padded_id in padded_ids}
+        stored = self.manifest.fingerprints()
+        pending = [
+            padded_id for padded_id, fingerprint in fingerprints.items()
+            if fingerprint is not None and stored.get(padded_id) != fingerprint
+        ]
+        missing_images = sum(fingerprint is None for fingerprint in fingerprints.values())
+        print(
+            f"🔎 {len(pending)} articles need captions "
+            f"({len(fingerprints) - len(pending) - missing_images} up to date, {missing_images} without an image)."
+        )
+
+        captioned = 0
+        if pending:
+            pending_df = df[padded_ids.isin(pending)]
+            dataset = self._create_dataset(pending_df)
+            dataloader = create_image_dataloader(dataset)
+            captioned = self._generate_captions(dataloader, fingerprints)
         
-        print("💾 Merging captions and saving to processed CSV...")
-        df["img_caption"] = df["article_id"].map(captions_dict)
+        print("💾 Merging captions and saving to processed catalog...")
+        captions = {
+            key: payload
+            for key, (fingerprint, payload) in self.manifest.entries().items()
+            if fingerprints.get(key) == fingerprint
+        }
+        df["img_caption"] = padded_ids.map(captions)
         
         original_count = len(df)
-        df.dropna(subset=['img_caption'], inplace=True)
-        df = df[df["img_caption"] != "caption_generation_failed"].copy()
+        df = df.dropna(subset=['img_caption'])
         final_count = len(df)
 
-        df.to_csv(settings.COMPLETE_ARTICLES_CSV_PATH, index=False)
-        print(f"   - Generated and saved {final_count}/{original_count} captions.")
+        write_catalog(df)
+        print(f"   - Generated {captioned} new captions; {final_count}/{original_count} articles have a caption.")
         print(f"   - Updated CSV saved to {settings.COMPLETE_ARTICLES_CSV_PATH}")
         
         print("--- ✅ Captioning Pipeline Finished ---")
-        return {"status": "success", "captions_generated": final_count}
\ No newline at end of file
+        return {"status": "success", "captions_generated": captioned, "articles_captioned": final_count}
@@ -1,4 +1,5 @@
 import os
+import json
 import torch
 from pathlib import Path
 from dotenv import load_dotenv
@@ -17,7 +18,12 @@ class Settings:
 
         self.ARTICLES_CSV_PATH = self.DATA_DIR / "articles.csv"
         self.COMPLETE_ARTICLES_CSV_PATH = self.DATA_DIR / "complete_articles.csv"
+        self.CATALOG_PARQUET_PATH = self.DATA_DIR / "complete_articles.parquet"
+        self.CATALOG_ROW_GROUP_SIZE = 20000
         self.EMBEDDING_SAVE_PATH = self.DATA_DIR / "embeddings.npz"
+        self.EMBEDDING_STORE_DIR = self.DATA_DIR / "embedding_store"
+        self.EMBEDDING_STORE_DTYPE = os.getenv("EMBEDDING_STORE_DTYPE", "float32")
+        self.MANIFEST_DB_PATH = self.DATA_DIR / "manifests.sqlite3"
         self.QUERIES_FILE_PATH = self.DATA_DIR / "fashion_queries.csv"
         self.GROUND_TRUTH_FILE = self.DATA_DIR / "ground_truth.csv"
         self.ANNOTATION_FILE_OUTPUT = self.REPORTS_DIR / "to_annotate.csv"
@@ -27,17 +33,68 @@ class Settings:
         self.IMAGE_CAPTION_MODEL = "Salesforce/blip-image-captioning-base"
         self.LLM_JUDGE_MODEL = os.getenv("LLM_JUDGE_MODEL", "qwen2.5:7b-instruct-q8_0")
 
+        self.TEXT_ENCODER_BACKEND = os.getenv("TEXT_ENCODER_BACKEND", "torch")
+        self.TEXT_ENCODER_MIN_COSINE = float(os.getenv("TEXT_ENCODER_MIN_COSINE", "0.99"))
+        self.TEXT_ENCODER_ONNX_PATH = self.DATA_DIR / "onnx" / "fashion_clip_text.onnx"
+
         self.TEXT_BATCH_SIZE = 512
+        self.EMBEDDING_STREAMING = os.getenv("EMBEDDING_STREAMING", "false").lower() == "true"
+        self.EMBEDDING_SHARD_SIZE = int(os.getenv("EMBEDDING_SHARD_SIZE", "20000"))
+        self.EMBEDDING_SHARD_DIR = self.DATA_DIR / "embedding_shards"
+        self.EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+        self.EMBEDDING_THREADS_PER_WORKER = int(os.getenv("EMBEDDING_THREADS_PER_WORKER", "0"))
         self.IMAGE_BATCH_SIZE = 64
+        self.CAPTIONING_PROFILE = os.getenv("CAPTIONING_PROFILE", "quality")
+        self.IMAGE_CACHE_DIR = self.DATA_DIR / "image_cache"
+        self.IMAGE_CACHE_SIZE = int(os.getenv("IMAGE_CACHE_SIZE", "384"))
+        self.IMAGE_CACHE_WORKERS = int(os.getenv("IMAGE_CACHE_WORKERS", str(os.cpu_count() or 1)))
+        self.IMAGE_VALIDATION_WORKERS = int(os.getenv("IMAGE_VALIDATION_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+        self.QUERY_EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("QUERY_EMBEDDING_MAX_BATCH_SIZE", "32"))
+        self.QUERY_EMBEDDING_MAX_WAIT_MS = float(os.getenv("QUERY_EMBEDDING_MAX_WAIT_MS", "5"))
+        self.QUERY_EMBEDDING_TIMEOUT_SECONDS = float(os.getenv("QUERY_EMBEDDING_TIMEOUT_SECONDS", "30"))
+        self.EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+        self.EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(30 * 24 * 3600))) or None
         self._setup_device_settings()
 
         self.EMB_DIM = 512
+        self.VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "milvus")
+        self.VECTOR_INDEX_COMPRESSION = os.getenv("VECTOR_INDEX_COMPRESSION", "none")
+        self.VECTOR_RESCORE_FACTOR = int(os.getenv("VECTOR_RESCORE_FACTOR", "4"))
+        self.PQ_SUBVECTORS = int(os.getenv("PQ_SUBVECTORS", "128"))
         self.MILVUS_INSERT_BATCH_SIZE = 10000
+        self.MILVUS_INSERT_WORKERS = int(os.getenv("MILVUS_INSERT_WORKERS", "4"))
         self.MILVUS_HOST = os.getenv("MILVUS_HOST", "localhost")
         self.MILVUS_PORT = os.getenv("MILVUS_PORT", "19530")
+        self.MILVUS_INDEX_PRESETS = {
+            "IVF_FLAT": {"index_params": {"nlist": 256}, "search_params": {"nprobe": 64}},
+            "IVF_SQ8": {"index_params": {"nlist": 256}, "search_params": {"nprobe": 64}},
+            "IVF_PQ": {"index_params": {"nlist": 256, "m": 64, "nbits": 8}, "search_params": {"nprobe": 64}},
+            "HNSW": {"index_params": {"M": 16, "efConstruction": 200}, "search_params": {"ef": 128}},
+        }
+        self.MILVUS_INDEX_TYPE = os.getenv("MILVUS_INDEX_TYPE", "IVF_FLAT")
+        self.MILVUS_KEEP_VERSIONS = int(os.getenv("MILVUS_KEEP_VERSIONS", "2"))
+        self.DB_SYNC_MODE = os.getenv("DB_SYNC_MODE", "full")
+        self.PARTITION_KEY_FIELD = os.getenv("PARTITION_KEY_FIELD", "index_name")
+        self.PARTITION_ROUTING_PROBES = int(os.getenv("PARTITION_ROUTING_PROBES", "0"))
+        self.MILVUS_SCALAR_INDEX_TYPE = os.getenv("MILVUS_SCALAR_INDEX_TYPE", "BITMAP")
+        if self.MILVUS_INDEX_TYPE not in self.MILVUS_INDEX_PRESETS:
+            raise ValueError(
+                f"Unsupported MILVUS_INDEX_TYPE '{self.MILVUS_INDEX_TYPE}'. "
+                f"Supported types: {', '.join(self.MILVUS_INDEX_PRESETS)}"
+            )
+        index_preset = self.MILVUS_INDEX_PRESETS[self.MILVUS_INDEX_TYPE]
+        self.MILVUS_INDEX_PARAMS = json.loads(os.getenv("MILVUS_INDEX_PARAMS", "null")) or index_preset["index_params"]
+        self.MILVUS_SEARCH_PARAMS = json.loads(os.getenv("MILVUS_SEARCH_PARAMS", "null")) or index_preset["search_params"]
 
         self.REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
         self.REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+        self.REDIS_LOAD_CHUNK_SIZE = int(os.getenv("REDIS_LOAD_CHUNK_SIZE", "5000"))
+        self.REDIS_SERIALIZER = os.getenv("REDIS_SERIALIZER", "orjson")
+        self.REDIS_COMPRESSION = os.getenv("REDIS_COMPRESSION", "zstd")
+        self.REDIS_COMPRESSION_THRESHOLD = int(os.getenv("REDIS_COMPRESSION_THRESHOLD", "512"))
+        self.ARTICLE_RECORD_FIELDS = os.getenv("ARTICLE_RECORD_FIELDS", "full")
+        self.INDEX_GENERATION_TTL_SECONDS = float(os.getenv("INDEX_GENERATION_TTL_SECONDS", "5"))
+        self.ARTICLE_CACHE_SIZE = int(os.getenv("ARTICLE_CACHE_SIZE", "20000"))
 
         self.EVALUATION_K = 10
         self.RELEVANCE_THRESHOLD = 2
@@ -61,6 +118,8 @@ class Settings:
             self.DEVICE = torch.device("mps")
         else:
             self.DEVICE = torch.device("cpu")
+        self.NUM_WORKERS = int(os.getenv("NUM_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.PIN_MEMORY = self.DEVICE.type == "cuda"
 
 
 settings = Settings()
\ No newline at end of file
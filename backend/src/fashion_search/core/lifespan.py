@@ -6,17 +6,19 @@ from llama_index.llms.ollama import Ollama
 from .config import settings
 from ..agents.orchestrator import MultiFashionAgent
 from ..llm.query_enhancer import LLMQueryEnhancer
-from ..milvus_client.vector_db_client import VectorDBClient
+from ..vector_index.factory import create_vector_client
 from ..redis_client.redis_db_client import RedisDBClient
 from ..services.redis_search_service import RedisSearchService
-from .model_loader import load_clip_model_and_processor
+from ..services.index_generation import IndexGeneration
+from ..services.article_cache import ArticleCache
+from ..embeddings.query_embedding_service import QueryEmbeddingService
+from ..embeddings.embedding_cache import EmbeddingCache
+from ..embeddings.text_encoder import load_text_encoder
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
-        app.state.db_client = VectorDBClient(
-            host=settings.MILVUS_HOST, port=settings.MILVUS_PORT
-        )
+        app.state.db_client = create_vector_client()
 
         app.state.db_client.set_collection("articles")
 
@@ -24,9 +26,16 @@ async def lifespan(app: FastAPI):
             host=settings.REDIS_HOST, port=int(settings.REDIS_PORT)
         )
 
-        model, processor = load_clip_model_and_processor()
+        app.state.index_generation = IndexGeneration(app.state.redis_client, app.state.db_client)
+        app.state.article_cache = ArticleCache(app.state.redis_client, app.state.index_generation)
+
+        model, processor = load_text_encoder()
         app.state.clip_model = model
         app.state.clip_processor = processor
+        app.state.embedding_cache = EmbeddingCache(
+            app.state.redis_client, model_name=getattr(model, "name", settings.IMAGE_TEXT_MODEL)
+        )
+        app.state.query_embedder = QueryEmbeddingService(model, processor, cache=app.state.embedding_cache)
 
         app.state.llm_enhancer = LLMQueryEnhancer(
             model=settings.LLM_JUDGE_MODEL, prompt_dir=settings.PROMPTS_DIR
@@ -38,6 +47,8 @@ async def lifespan(app: FastAPI):
             llm_enhancer=app.state.llm_enhancer,
             model=app.state.clip_model,
             processor=app.state.clip_processor,
+            index_generation=app.state.index_generation,
+            embedder=app.state.query_embedder,
         )
 
         llm_for_agent = Ollama(
@@ -53,4 +64,10 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    print("🔌 Server shutting down...")
\ No newline at end of file
+    print("🔌 Server shutting down...")
+    if query_embedder := getattr(app.state, "query_embedder", None):
+        query_embedder.close()
+    if embedding_cache := getattr(app.state, "embedding_cache", None):
+        print(f"📊 Embedding cache stats: {embedding_cache.stats()}")
+    if article_cache := getattr(app.state, "article_cache", None):
+        print(f"📊 Article cache stats: {article_cache.stats()}")
\ No newline at end of file
@@ -0,0 +1,110 @@
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Iterator
+
+from ..core.config import settings
+
+RICH_TEXT_COLUMNS = [
+    "prod_name",
+    "product_type_name",
+    "product_group_name",
+    "colour_group_name",
+    "detail_desc",
+    "img_caption",
+]
+FREE_TEXT_COLUMNS = ["prod_name", "detail_desc", "img_caption"]
+
+
+def _is_categorical(column: str) -> bool:
+    return column.endswith("_name") and column not in FREE_TEXT_COLUMNS
+
+
+def _csv_dtypes(columns: list[str]) -> dict:
+    dtypes = {"article_id": str}
+    for column in columns:
+        if column in FREE_TEXT_COLUMNS:
+            dtypes[column] = "string"
+        elif _is_categorical(column):
+            dtypes[column] = "category"
+    return dtypes
+
+
+def _normalize_types(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["article_id"] = df["article_id"].astype(str)
+    for column in df.columns:
+        if column in FREE_TEXT_COLUMNS:
+            df[column] = df[column].astype("string")
+        elif _is_categorical(column):
+            df[column] = df[column].astype("string").fillna("").astype("category")
+    return _with_empty_category(df)
+
+
+def _with_empty_category(df: pd.DataFrame) -> pd.DataFrame:
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and "" not in df[column].cat.categories:
+            df[column] = df[column].cat.add_categories("")
+    return df
+
+
+def read_articles_csv(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    usecols = [column for column in header if columns is None or column in columns]
+    df = pd.read_csv(path, usecols=usecols, dtype=_csv_dtypes(usecols))
+    return _normalize_types(df)
+
+
+def write_catalog(df: pd.DataFrame, csv_path: Path = settings.COMPLETE_ARTICLES_CSV_PATH,
+                  parquet_path: Path = settings.CATALOG_PARQUET_PATH):
+    df = _normalize_types(df)
+    df.to_csv(csv_path, index=False)
+    tmp_path = parquet_path.with_name(f"{parquet_path.name}.tmp")
+    df.to_parquet(tmp_path, index=False, row_group_size=settings.CATALOG_ROW_GROUP_SIZE)
+    os.replace(tmp_path, parquet_path)
+
+
+def ensure_catalog(csv_path: Path = settings.COMPLETE_ARTICLES_CSV_PATH,
+                   parquet_path: Path = settings.CATALOG_PARQUET_PATH) -> Path:
+    if parquet_path.exists() and (not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        return parquet_path
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Article catalog not found at {parquet_path} or {csv_path}")
+
+    print(f"🗂️ Converting {csv_path.name} to columnar catalog {parquet_path.name}...")
+    write_catalog(read_articles_csv(csv_path), csv_path=csv_path, parquet_path=parquet_path)
+    return parquet_path
+
+
+def _available_columns(path: Path, columns: list[str] | None) -> list[str] | None:
+    if columns is None:
+        return None
+    schema_names = set(pq.read_schema(path).names)
+    return [column for column in columns if column in schema_names]
+
+
+def load_catalog(columns: list[str] | None = None, csv_path: Path = settings.COMPLETE_ARTICLES_CSV_PATH,
+                 parquet_path: Path = settings.CATALOG_PARQUET_PATH) -> pd.DataFrame:
+    path = ensure_catalog(csv_path, parquet_path)
+    return _with_empty_category(pd.read_parquet(path, columns=_available_columns(path, columns)))
+
+
+def iter_catalog_batches(batch_size: int, columns: list[str] | None = None,
+                         csv_path: Path = settings.COMPLETE_ARTICLES_CSV_PATH,
+                         parquet_path: Path = settings.CATALOG_PARQUET_PATH) -> Iterator[pd.DataFrame]:
+    path = ensure_catalog(csv_path, parquet_path)
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=_available_columns(path, columns)):
+        yield _with_empty_category(batch.to_pandas())
+
+
+def rich_text(df: pd.DataFrame, columns: list[str] = RICH_TEXT_COLUMNS) -> pd.Series:
+    text = pd.Series("", index=df.index, dtype="string")
+    for column in columns:
+        if column not in df.columns:
+            continue
+        values = df[column].astype("string")
+        keep = values.str.strip().fillna("").ne("")
+        text = text + (values + " ").where(keep, "")
+    return text.str.slice(stop=-1).astype(object)
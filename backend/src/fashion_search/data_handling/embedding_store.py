@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+from pathlib import Path
+
+from ..core.config import settings
+
+
+class EmbeddingStore:
+    def __init__(self, directory: Path = settings.EMBEDDING_STORE_DIR):
+        self.directory = directory
+        self.embeddings_path = directory / "embeddings.npy"
+        self.ids_path = directory / "article_ids.npy"
+        self.meta_path = directory / "meta.json"
+
+    @classmethod
+    def create(cls, num_rows: int, dim: int, id_width: int, dtype: str = settings.EMBEDDING_STORE_DTYPE,
+               directory: Path = settings.EMBEDDING_STORE_DIR) -> "EmbeddingStore":
+        store = cls(directory.with_name(f"{directory.name}.tmp"))
+        shutil.rmtree(store.directory, ignore_errors=True)
+        store.directory.mkdir(parents=True)
+        np.lib.format.open_memmap(store.embeddings_path, mode="w+", dtype=np.dtype(dtype), shape=(num_rows, dim))
+        np.lib.format.open_memmap(store.ids_path, mode="w+", dtype=f"S{id_width}", shape=(num_rows,))
+        return store
+
+    def writable(self) -> tuple[np.ndarray, np.ndarray]:
+        embeddings = np.lib.format.open_memmap(self.embeddings_path, mode="r+")
+        article_ids = np.lib.format.open_memmap(self.ids_path, mode="r+")
+        return article_ids, embeddings
+
+    def finalize(self, directory: Path = settings.EMBEDDING_STORE_DIR, **metadata) -> "EmbeddingStore":
+        article_ids, embeddings = self.writable()
+        meta = {
+            "rows": int(embeddings.shape[0]),
+            "dim": int(embeddings.shape[1]),
+            "dtype": str(embeddings.dtype),
+            "created_at": time.time(),
+            **metadata,
+        }
+        embeddings.flush()
+        article_ids.flush()
+        del article_ids, embeddings
+        self.meta_path.write_text(json.dumps(meta, indent=2))
+
+        previous = directory.with_name(f"{directory.name}.old")
+        shutil.rmtree(previous, ignore_errors=True)
+        if directory.exists():
+            os.replace(directory, previous)
+        os.replace(self.directory, directory)
+        shutil.rmtree(previous, ignore_errors=True)
+        return EmbeddingStore(directory)
+
+    def exists(self) -> bool:
+        return self.meta_path.exists()
+
+    @property
+    def meta(self) -> dict:
+        return json.loads(self.meta_path.read_text())
+
+    def open(self) -> tuple[np.ndarray, np.ndarray]:
+        embeddings = np.load(self.embeddings_path, mmap_mode="r")
+        article_ids = np.load(self.ids_path, mmap_mode="r")
+        return article_ids, embeddings
+
+
+def encode_article_ids(article_ids) -> np.ndarray:
+    try:
+        return np.char.encode(np.asarray(article_ids, dtype=str), "ascii")
+    except UnicodeEncodeError as e:
+        raise ValueError(f"Article IDs must be ASCII to be stored in the embedding store: {e}") from e
+
+
+def decode_article_ids(article_ids: np.ndarray) -> list[str]:
+    if article_ids.dtype.kind == "S":
+        return np.char.decode(article_ids, "ascii").tolist()
+    return article_ids.tolist()
+
+
+def write_embedding_store(article_ids: np.ndarray, embeddings: np.ndarray,
+                          directory: Path = settings.EMBEDDING_STORE_DIR, **metadata) -> EmbeddingStore:
+    article_ids = encode_article_ids(article_ids)
+    store = EmbeddingStore.create(len(embeddings), embeddings.shape[1], max(article_ids.dtype.itemsize, 1), directory=directory)
+    ids_out, embeddings_out = store.writable()
+    ids_out[:] = article_ids
+    embeddings_out[:] = embeddings
+    del ids_out, embeddings_out
+    return store.finalize(directory, **metadata)
+
+
+def embeddings_source(npz_path: Path = settings.EMBEDDING_SAVE_PATH, store_dir: Path = settings.EMBEDDING_STORE_DIR) -> Path:
+    store = EmbeddingStore(store_dir)
+    if store.exists() and (not npz_path.exists() or store.meta_path.stat().st_mtime >= npz_path.stat().st_mtime):
+        return store.meta_path
+    return npz_path
+
+
+def load_embeddings(npz_path: Path = settings.EMBEDDING_SAVE_PATH, store_dir: Path = settings.EMBEDDING_STORE_DIR) -> tuple[list[str], np.ndarray]:
+    source = embeddings_source(npz_path, store_dir)
+    if source == npz_path:
+        print(f"📥 Loading embeddings from {npz_path} (no up-to-date memory-mapped store found)")
+        embeddings_data = np.load(npz_path, allow_pickle=True)
+        return [str(aid) for aid in embeddings_data["article_ids"]], embeddings_data["embeddings"]
+
+    article_ids, embeddings = EmbeddingStore(store_dir).open()
+    print(f"📥 Memory-mapped {len(embeddings)} {embeddings.dtype} embeddings from {store_dir}")
+    return decode_article_ids(article_ids), embeddings
@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+import pandas as pd
+import torch
+from PIL import Image
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from torch.utils.data import Dataset
+
+from ..core.config import settings
+
+
+def image_path_for(article_id: str) -> str:
+    padded_id = str(article_id).zfill(10)
+    return os.path.join(settings.IMAGE_BASE_DIR, padded_id[:3], f"{padded_id}.jpg")
+
+
+def image_fingerprint(image_path: str) -> str:
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def decode_image(image_path: str, image_size: int) -> np.ndarray:
+    with Image.open(image_path) as image:
+        image.draft("RGB", (image_size, image_size))
+        image = image.convert("RGB").resize((image_size, image_size), Image.BICUBIC)
+        return np.asarray(image, dtype=np.uint8)
+
+
+class ImageTensorCache:
+    def __init__(self, directory: Path = settings.IMAGE_CACHE_DIR):
+        self.directory = directory
+        self.images_path = directory / "images.npy"
+        self.ids_path = directory / "article_ids.npy"
+        self.fingerprints_path = directory / "fingerprints.npy"
+        self.meta_path = directory / "meta.json"
+        self.images: np.ndarray | None = None
+        self.row_for_id: dict[str, int] = {}
+        self.fingerprints: np.ndarray | None = None
+
+    def exists(self) -> bool:
+        return self.meta_path.exists()
+
+    @property
+    def image_size(self) -> int:
+        return json.loads(self.meta_path.read_text())["image_size"]
+
+    def open(self) -> "ImageTensorCache":
+        self.images = np.load(self.images_path, mmap_mode="r")
+        self.fingerprints = np.load(self.fingerprints_path)
+        article_ids = np.load(self.ids_path)
+        self.row_for_id = {str(article_id): row for row, article_id in enumerate(article_ids)}
+        return self
+
+    def get(self, article_id: str) -> np.ndarray | None:
+        padded_id = str(article_id).zfill(10)
+        row = self.row_for_id.get(padded_id)
+        if row is None or not self.fingerprints[row]:
+            return None
+        if self.fingerprints[row] != image_fingerprint(image_path_for(padded_id)):
+            return None
+        if self.images is None:
+            self.images = np.load(self.images_path, mmap_mode="r")
+        return self.images[row]
+
+    def __getstate__(self):
+        return {**self.__dict__, "images": None}
+
+
+def build_image_cache(
+    article_ids: pd.Series,
+    image_size: int = settings.IMAGE_CACHE_SIZE,
+    directory: Path = settings.IMAGE_CACHE_DIR,
+    max_workers: int = settings.IMAGE_CACHE_WORKERS,
+) -> ImageTensorCache:
+    padded_ids = article_ids.astype(str).str.zfill(10).drop_duplicates().tolist()
+    image_paths = [image_path_for(padded_id) for padded_id in padded_ids]
+    fingerprints = [image_fingerprint(path) for path in image_paths]
+
+    previous = ImageTensorCache(directory)
+    if previous.exists() and previous.image_size == image_size:
+        previous.open()
+    else:
+        previous = None
+
+    tmp_dir = directory.with_name(f"{directory.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    staged = ImageTensorCache(tmp_dir)
+    images = np.lib.format.open_memmap(staged.images_path, mode="w+", dtype=np.uint8, shape=(len(padded_ids), image_size, image_size, 3))
+    stored_fingerprints = np.array(fingerprints, dtype=object)
+
+    to_decode = []
+    for row, (padded_id, fingerprint) in enumerate(zip(padded_ids, fingerprints)):
+        if not fingerprint:
+            continue
+        previous_row = previous.row_for_id.get(padded_id) if previous else None
+        if previous_row is not None and previous.fingerprints[previous_row] == fingerprint:
+            images[row] = previous.images[previous_row]
+        else:
+            to_decode.append(row)
+
+    def decode_into(row: int) -> bool:
+        try:
+            images[row] = decode_image(image_paths[row], image_size)
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not decode {image_paths[row]}: {e}")
+            stored_fingerprints[row] = ""
+            return False
+
+    print(f"🖼️ Decoding {len(to_decode)} images at {image_size}px ({len(padded_ids) - len(to_decode)} reused or missing)...")
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        decoded = sum(pool.map(decode_into, to_decode))
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    print(f"   - Decoded {decoded} images at {decoded / elapsed:.1f} images/sec")
+
+    images.flush()
+    del images
+    np.save(staged.ids_path, np.array(padded_ids, dtype=str))
+    np.save(staged.fingerprints_path, stored_fingerprints.astype(str))
+    staged.meta_path.write_text(json.dumps({"image_size": image_size, "rows": len(padded_ids), "created_at": time.time()}))
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+    print(f"✅ Image cache written to {directory}")
+    return ImageTensorCache(directory).open()
+
+
+class CachedImageDataset(Dataset):
+    def __init__(self, df, cache: ImageTensorCache, processor):
+        self.article_ids = df["article_id"].astype(str).str.zfill(10).tolist()
+        self.cache = cache
+        image_processor = getattr(processor, "image_processor", processor)
+        self.mean = torch.tensor(image_processor.image_mean).view(3, 1, 1)
+        self.std = torch.tensor(image_processor.image_std).view(3, 1, 1)
+        self.image_size = cache.image_size
+
+    def __len__(self):
+        return len(self.article_ids)
+
+    def __getitem__(self, idx):
+        article_id = self.article_ids[idx]
+        image = self.cache.get(article_id)
+        if image is None:
+            try:
+                image = decode_image(image_path_for(article_id), self.image_size)
+            except Exception as e:
+                print(f"❌ Failed to load image for article {article_id}: {e}")
+                return torch.zeros((3, self.image_size, self.image_size)), article_id
+
+        pixel_values = torch.from_numpy(np.array(image)).permute(2, 0, 1).float().div_(255)
+        return (pixel_values - self.mean) / self.std, article_id
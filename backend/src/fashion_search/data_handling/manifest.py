@@ -0,0 +1,81 @@
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterable
+
+
+def fingerprint_records(df: pd.DataFrame, columns: list[str], vectors: np.ndarray | None = None) -> list[str]:
+    scalar_hashes = pd.util.hash_pandas_object(df[columns].fillna("").astype(str), index=False).to_numpy()
+    if vectors is None:
+        return [f"{value:016x}" for value in scalar_hashes]
+
+    vectors = np.ascontiguousarray(vectors)
+    return [
+        hashlib.blake2b(vector.tobytes() + scalar_hash.tobytes(), digest_size=16).hexdigest()
+        for vector, scalar_hash in zip(vectors, scalar_hashes)
+    ]
+
+
+class ManifestStore:
+    def __init__(self, path: Path, namespace: str):
+        self.path = path
+        self.namespace = namespace
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS manifest ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, fingerprint TEXT NOT NULL, payload TEXT,"
+                " PRIMARY KEY (namespace, key))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM manifest WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def fingerprints(self) -> dict[str, str]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, fingerprint FROM manifest WHERE namespace = ?", (self.namespace,))
+            return dict(rows.fetchall())
+
+    def entries(self) -> dict[str, tuple[str, str | None]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, fingerprint, payload FROM manifest WHERE namespace = ?", (self.namespace,))
+            return {key: (fingerprint, payload) for key, fingerprint, payload in rows.fetchall()}
+
+    def upsert_many(self, entries: Iterable[tuple[str, str, str | None]]):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO manifest (namespace, key, fingerprint, payload) VALUES (?, ?, ?, ?)",
+                ((self.namespace, key, fingerprint, payload) for key, fingerprint, payload in entries),
+            )
+
+    def delete_many(self, keys: Iterable[str]):
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM manifest WHERE namespace = ? AND key = ?",
+                ((self.namespace, key) for key in keys),
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM manifest WHERE namespace = ?", (self.namespace,))
+
+    def replace_all(self, entries: Iterable[tuple[str, str, str | None]]):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM manifest WHERE namespace = ?", (self.namespace,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO manifest (namespace, key, fingerprint, payload) VALUES (?, ?, ?, ?)",
+                ((self.namespace, key, fingerprint, payload) for key, fingerprint, payload in entries),
+            )
@@ -0,0 +1,19 @@
+import os
+import zipfile
+import numpy as np
+from pathlib import Path
+from typing import Iterable
+
+
+def write_npz_from_chunks(path: Path, arrays: dict[str, tuple[tuple, np.dtype, Iterable[np.ndarray]]]):
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, (shape, dtype, chunks) in arrays.items():
+            dtype = np.dtype(dtype)
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as entry:
+                np.lib.format.write_array_header_2_0(
+                    entry, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": shape}
+                )
+                for chunk in chunks:
+                    entry.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+    os.replace(tmp_path, path)
@@ -0,0 +1,88 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+
+from ..core.config import settings
+from ..redis_client.redis_db_client import RedisDBClient
+
+
+def normalize_query_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        redis_client: RedisDBClient | None,
+        model_name: str = settings.IMAGE_TEXT_MODEL,
+        max_entries: int = settings.EMBEDDING_CACHE_SIZE,
+        ttl: int | None = settings.EMBEDDING_CACHE_TTL_SECONDS,
+    ):
+        self.redis_client = redis_client
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key_for(self, text: str) -> str:
+        digest = hashlib.blake2b(normalize_query_text(text).encode("utf-8"), digest_size=16).hexdigest()
+        return f"emb:{self.model_name}:{digest}"
+
+    def get_many(self, texts: list[str]) -> list[np.ndarray | None]:
+        keys = [self.key_for(text) for text in texts]
+        results: list[np.ndarray | None] = [None] * len(texts)
+        remote_positions = []
+
+        with self._lock:
+            for position, key in enumerate(keys):
+                if (vector := self._entries.get(key)) is not None:
+                    self._entries.move_to_end(key)
+                    results[position] = vector
+                    self.local_hits += 1
+                else:
+                    remote_positions.append(position)
+
+        if remote_positions and self.redis_client:
+            remote_values = self.redis_client.get_bytes_many([keys[position] for position in remote_positions])
+            fetched = {}
+            for position, raw in zip(remote_positions, remote_values):
+                if raw is not None:
+                    results[position] = fetched[keys[position]] = np.frombuffer(raw, dtype=np.float32)
+            self._remember(fetched)
+            with self._lock:
+                self.redis_hits += len(fetched)
+
+        with self._lock:
+            self.misses += sum(vector is None for vector in results)
+        return results
+
+    def put_many(self, texts: list[str], vectors: list[list[float]]):
+        entries = {
+            self.key_for(text): np.asarray(vector, dtype=np.float32)
+            for text, vector in zip(texts, vectors)
+        }
+        self._remember(entries)
+        if self.redis_client:
+            self.redis_client.set_bytes_many({key: vector.tobytes() for key, vector in entries.items()}, ttl=self.ttl)
+
+    def _remember(self, entries: dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in entries.items():
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
@@ -1,3 +1,10 @@
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import pandas as pd
 import numpy as np
 import torch
@@ -5,61 +12,123 @@ from tqdm import tqdm
 from transformers import logging as transformers_logging
 
 from ..core.config import settings
-from ..core.model_loader import load_clip_model_and_processor
+from .text_encoder import load_text_encoder
+from ..data_handling.manifest import ManifestStore
+from ..data_handling.npz_writer import write_npz_from_chunks
+from ..data_handling.embedding_store import EmbeddingStore, encode_article_ids, write_embedding_store
+from ..data_handling.catalog import RICH_TEXT_COLUMNS, iter_catalog_batches, load_catalog, rich_text
+
+_worker_pipeline = None
+
+
+def _init_embedding_worker(num_threads: int):
+    global _worker_pipeline
+    torch.set_num_threads(num_threads)
+    _worker_pipeline = EmbeddingPipeline(streaming=False, workers=1)
+
+
+def _embed_rows_into_store(store_dir: Path, start: int, texts: list[str]) -> int:
+    embeddings = _worker_pipeline._generate_embeddings(texts)
+    _, store_embeddings = EmbeddingStore(store_dir).writable()
+    store_embeddings[start:start + len(texts)] = embeddings
+    store_embeddings.flush()
+    return len(texts)
+
 
 class EmbeddingPipeline:
-    def __init__(self):
+    def __init__(
+        self,
+        streaming: bool = settings.EMBEDDING_STREAMING,
+        shard_size: int = settings.EMBEDDING_SHARD_SIZE,
+        workers: int = settings.EMBEDDING_WORKERS,
+    ):
         transformers_logging.set_verbosity_error()
-        self.device = settings.DEVICE
-        self.model, self.processor = load_clip_model_and_processor()
-        self.model.to(self.device)
-
-    @staticmethod
-    def _create_rich_text_description(row: pd.Series) -> str:
-        parts = [
-            row.get('prod_name'),
-            row.get('product_type_name'),
-            row.get('product_group_name'),
-            row.get('colour_group_name'),
-            row.get('detail_desc'),
-            row.get('img_caption')
-        ]
-        return ' '.join([str(p) for p in parts if pd.notna(p) and str(p).strip()])
+        self.model, self.processor = load_text_encoder()
+        self.device = self.model.device
+        self.streaming = streaming
+        self.shard_size = shard_size
+        self.workers = workers
 
     def _load_data(self) -> pd.DataFrame:
-        print(f"📄 Loading data from: {settings.COMPLETE_ARTICLES_CSV_PATH}")
-        df = pd.read_csv(settings.COMPLETE_ARTICLES_CSV_PATH, dtype={'article_id': str})
+        print(f"📄 Loading data from: {settings.CATALOG_PARQUET_PATH}")
+        df = load_catalog(columns=["article_id", *RICH_TEXT_COLUMNS])
         print(f"   - Loaded {len(df)} articles.")
         return df
 
     def _create_rich_text(self, df: pd.DataFrame) -> list[str]:
         print("📝 Creating rich text descriptions from metadata...")
-        tqdm.pandas(desc="Featurizing rows")
-        rich_texts = df.progress_apply(self._create_rich_text_description, axis=1).tolist()
-        return rich_texts
+        return rich_text(df).tolist()
+
+    def _tokenize(self, texts: list[str]) -> dict:
+        print("🔤 Tokenizing texts to bucket them by length...")
+        return self.processor.tokenizer(texts, truncation=True, max_length=77)
 
     def _generate_embeddings(self, texts: list[str]) -> np.ndarray:
-        print(f"🧠 Generating embeddings in batches of {settings.TEXT_BATCH_SIZE}...")
-        all_embeddings = []
-        
+        print(f"🧠 Generating embeddings in length-sorted batches of {settings.TEXT_BATCH_SIZE}...")
+        tokens = self._tokenize(texts)
+        lengths = np.array([len(ids) for ids in tokens["input_ids"]])
+        order = np.argsort(lengths, kind="stable")
+        embeddings = None
+        padded_tokens = 0
+        start_time = time.perf_counter()
+
         with torch.no_grad():
             for i in tqdm(range(0, len(texts), settings.TEXT_BATCH_SIZE), desc="Embedding Batches"):
-                batch_texts = texts[i:i + settings.TEXT_BATCH_SIZE]
-                inputs = self.processor(
-                    text=batch_texts, 
-                    return_tensors="pt", 
-                    padding=True, 
-                    truncation=True, 
-                    max_length=77
+                batch_rows = order[i:i + settings.TEXT_BATCH_SIZE]
+                inputs = self.processor.tokenizer.pad(
+                    {
+                        "input_ids": [tokens["input_ids"][row] for row in batch_rows],
+                        "attention_mask": [tokens["attention_mask"][row] for row in batch_rows],
+                    },
+                    return_tensors="pt",
                 ).to(self.device)
-                
+                padded_tokens += inputs["input_ids"].numel()
+
                 batch_embeds = self.model.get_text_features(**inputs)
                 batch_embeds /= batch_embeds.norm(dim=-1, keepdim=True)
-                all_embeddings.append(batch_embeds.cpu().numpy())
-        
-        return np.vstack(all_embeddings)
+                batch_embeds = batch_embeds.cpu().numpy()
+                if embeddings is None:
+                    embeddings = np.empty((len(texts), batch_embeds.shape[1]), dtype=batch_embeds.dtype)
+                embeddings[batch_rows] = batch_embeds
+
+        elapsed = time.perf_counter() - start_time
+        file_order_batches = np.split(lengths, np.arange(settings.TEXT_BATCH_SIZE, len(lengths), settings.TEXT_BATCH_SIZE))
+        file_order_tokens = sum(len(batch) * batch.max() for batch in file_order_batches)
+        print(
+            f"   - Padding efficiency: {lengths.sum() / max(padded_tokens, 1):.1%} "
+            f"(file order would be {lengths.sum() / max(file_order_tokens, 1):.1%})"
+        )
+        print(f"   - Throughput: {len(texts) / elapsed:.1f} texts/sec")
+        return embeddings
+
+    def _generate_embeddings_parallel(self, article_ids: np.ndarray, texts: list[str]) -> EmbeddingStore:
+        threads_per_worker = settings.EMBEDDING_THREADS_PER_WORKER or max(1, (os.cpu_count() or 1) // self.workers)
+        print(f"🧠 Generating embeddings with {self.workers} worker processes x {threads_per_worker} threads...")
+        article_ids = encode_article_ids(article_ids)
+        store = EmbeddingStore.create(len(texts), self.model.config.projection_dim, max(article_ids.dtype.itemsize, 1))
+        store_ids, _ = store.writable()
+        store_ids[:] = article_ids
+        del store_ids
+
+        slice_bounds = np.linspace(0, len(texts), self.workers + 1, dtype=int)
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_embedding_worker,
+            initargs=(threads_per_worker,),
+        ) as pool:
+            futures = [
+                pool.submit(_embed_rows_into_store, store.directory, int(start), texts[start:end])
+                for start, end in zip(slice_bounds[:-1], slice_bounds[1:])
+                if end > start
+            ]
+            embedded = sum(future.result() for future in futures)
 
-    def _save_artifacts(self, df: pd.DataFrame, embeddings: np.ndarray):
+        print(f"   - Embedded {embedded} texts at {embedded / (time.perf_counter() - start_time):.1f} texts/sec overall")
+        return store
+
+    def _save_artifacts(self, df: pd.DataFrame, embeddings: np.ndarray, write_store: bool = True):
         print(f"💾 Saving artifacts to {settings.EMBEDDING_SAVE_PATH}...")
         article_ids_array = df["article_id"].to_numpy()
 
@@ -68,15 +137,126 @@ class EmbeddingPipeline:
             embeddings=embeddings,
             article_ids=article_ids_array
         )
-        # ----------------------
-
         print(f"   - Saved {len(embeddings)} embeddings and {len(article_ids_array)} article IDs.")
 
+        if not write_store:
+            return
+        store = write_embedding_store(article_ids_array, embeddings, model=self._encoder_name(), normalized=True)
+        print(f"   - Wrote memory-mappable store to {store.directory}")
+
+    def _encoder_name(self) -> str:
+        return getattr(self.model, "name", settings.IMAGE_TEXT_MODEL)
+
+    def _shard_fingerprint(self, article_ids: list[str], texts: list[str]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self._encoder_name().encode("utf-8"))
+        for article_id, text in zip(article_ids, texts):
+            digest.update(f"{article_id}\x1f{text}\x1e".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _shard_path(self, shard_index: int):
+        return settings.EMBEDDING_SHARD_DIR / f"shard_{shard_index:05d}.npz"
+
+    def _write_shard(self, shard_index: int, article_ids: list[str], embeddings: np.ndarray):
+        path = self._shard_path(shard_index)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, embeddings=embeddings.astype(np.float32), article_ids=np.array(article_ids, dtype=str))
+        os.replace(tmp_path, path)
+
+    def _embed_shards(self, manifest: ManifestStore) -> list[int]:
+        completed = manifest.fingerprints()
+        shard_rows = []
+        print(f"📄 Streaming {settings.CATALOG_PARQUET_PATH} in shards of {self.shard_size} articles...")
+        chunks = iter_catalog_batches(self.shard_size, columns=["article_id", *RICH_TEXT_COLUMNS])
+
+        for shard_index, chunk in enumerate(chunks):
+            article_ids = chunk["article_id"].tolist()
+            texts = self._create_rich_text(chunk)
+            fingerprint = self._shard_fingerprint(article_ids, texts)
+            shard_rows.append(len(chunk))
+
+            key = str(shard_index)
+            if completed.get(key) == fingerprint and self._shard_path(shard_index).exists():
+                print(f"⏭️ Shard {shard_index} unchanged; reusing checkpoint.")
+                continue
+
+            print(f"🧩 Embedding shard {shard_index} ({len(chunk)} articles)...")
+            self._write_shard(shard_index, article_ids, self._generate_embeddings(texts))
+            manifest.upsert_many([(key, fingerprint, json.dumps({"rows": len(chunk)}))])
+
+        stale_keys = [key for key in completed if int(key) >= len(shard_rows)]
+        for key in stale_keys:
+            self._shard_path(int(key)).unlink(missing_ok=True)
+        manifest.delete_many(stale_keys)
+        return shard_rows
+
+    def _iter_shard_arrays(self, num_shards: int, name: str):
+        for shard_index in range(num_shards):
+            with np.load(self._shard_path(shard_index)) as shard:
+                yield shard[name]
+
+    def _merge_shards(self, shard_rows: list[int]) -> int:
+        total_rows = sum(shard_rows)
+        with np.load(self._shard_path(0)) as first_shard:
+            embedding_dim = first_shard["embeddings"].shape[1]
+        id_width = max(article_ids.dtype.itemsize // 4 for article_ids in self._iter_shard_arrays(len(shard_rows), "article_ids"))
+
+        print(f"💾 Streaming {len(shard_rows)} shards into {settings.EMBEDDING_SAVE_PATH}...")
+        write_npz_from_chunks(
+            settings.EMBEDDING_SAVE_PATH,
+            {
+                "embeddings": ((total_rows, embedding_dim), np.float32, self._iter_shard_arrays(len(shard_rows), "embeddings")),
+                "article_ids": ((total_rows,), f"<U{id_width}", self._iter_shard_arrays(len(shard_rows), "article_ids")),
+            },
+        )
+        print(f"   - Saved {total_rows} embeddings and article IDs.")
+
+        store = EmbeddingStore.create(total_rows, embedding_dim, id_width)
+        article_ids_out, embeddings_out = store.writable()
+        offset = 0
+        for shard_ids, shard_embeddings in zip(
+            self._iter_shard_arrays(len(shard_rows), "article_ids"),
+            self._iter_shard_arrays(len(shard_rows), "embeddings"),
+        ):
+            article_ids_out[offset:offset + len(shard_ids)] = encode_article_ids(shard_ids)
+            embeddings_out[offset:offset + len(shard_ids)] = shard_embeddings
+            offset += len(shard_ids)
+        del article_ids_out, embeddings_out
+        store = store.finalize(model=self._encoder_name(), normalized=True)
+        print(f"   - Wrote memory-mappable store to {store.directory}")
+        return total_rows
+
+    def run_streaming(self) -> dict:
+        settings.EMBEDDING_SHARD_DIR.mkdir(parents=True, exist_ok=True)
+        manifest = ManifestStore(settings.MANIFEST_DB_PATH, namespace="embedding_shards")
+        shard_rows = self._embed_shards(manifest)
+        if not shard_rows:
+            raise Exception(f"No articles found in {settings.CATALOG_PARQUET_PATH}.")
+        total_rows = self._merge_shards(shard_rows)
+
+        print("\n✅ Streaming embedding pipeline completed successfully!")
+        return {
+            "status": "success",
+            "embeddings_generated": total_rows,
+            "shards": len(shard_rows),
+        }
+
     def run(self) -> dict:
+        if self.streaming:
+            return self.run_streaming()
+
         df = self._load_data()
         texts = self._create_rich_text(df)
-        embeddings = self._generate_embeddings(texts)
-        self._save_artifacts(df, embeddings)
+        if self.workers > 1 and self.device.type == "cpu":
+            staged_store = self._generate_embeddings_parallel(df["article_id"].to_numpy(), texts)
+            _, embeddings = staged_store.open()
+            self._save_artifacts(df, embeddings, write_store=False)
+            store = staged_store.finalize(model=self._encoder_name(), normalized=True)
+            print(f"   - Wrote memory-mappable store to {store.directory}")
+        else:
+            embeddings = self._generate_embeddings(texts)
+            self._save_artifacts(df, embeddings)
         
         print("\n✅ Embedding pipeline completed successfully!")
         
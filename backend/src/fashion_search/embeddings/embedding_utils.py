@@ -1,19 +1,22 @@
 import torch
-from functools import lru_cache
 
 
-@lru_cache(maxsize=256)
-def embed_text_query(model, processor, text: str) -> list[float]:
-    if not text or not text.strip():
-        try:
-            dim = model.text_projection.shape[1]
-        except AttributeError:
-            dim = 512
-        return [0.0] * dim
-
-    device = next(model.parameters()).device
+def _embedding_dim(model) -> int:
+    try:
+        return model.config.projection_dim
+    except AttributeError:
+        return 512
+
+
+def embed_text_queries(model, processor, texts: list[str]) -> list[list[float]]:
+    results = [[0.0] * _embedding_dim(model) for _ in texts]
+    positions = [i for i, text in enumerate(texts) if text and text.strip()]
+    if not positions:
+        return results
+
+    device = model.device
     inputs = processor(
-        text=[text], return_tensors="pt", padding=True, truncation=True, max_length=77
+        text=[texts[i] for i in positions], return_tensors="pt", padding=True, truncation=True, max_length=77
     ).to(device)
 
     with torch.no_grad():
@@ -27,4 +30,10 @@ def embed_text_query(model, processor, text: str) -> list[float]:
         epsilon = 1e-8
         normalized_embedding = text_embedding / (norm + epsilon)
 
-    return normalized_embedding[0].cpu().numpy().tolist()
+    for position, vector in zip(positions, normalized_embedding.cpu().numpy().tolist()):
+        results[position] = vector
+    return results
+
+
+def embed_text_query(model, processor, text: str) -> list[float]:
+    return embed_text_queries(model, processor, [text])[0]
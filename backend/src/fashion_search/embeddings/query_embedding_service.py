@@ -0,0 +1,120 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+from ..core.config import settings
+from .embedding_utils import embed_text_queries
+from .embedding_cache import EmbeddingCache
+
+
+class QueryEmbeddingService:
+    def __init__(
+        self,
+        model,
+        processor,
+        max_batch_size: int = settings.QUERY_EMBEDDING_MAX_BATCH_SIZE,
+        max_wait_ms: float = settings.QUERY_EMBEDDING_MAX_WAIT_MS,
+        cache: EmbeddingCache | None = None,
+        timeout: float = settings.QUERY_EMBEDDING_TIMEOUT_SECONDS,
+    ):
+        self.model = model
+        self.processor = processor
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.timeout = timeout
+        self.batches_run = 0
+        self.texts_embedded = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="query-embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        cached = self.cache.get_many(texts) if self.cache else [None] * len(texts)
+        futures = {
+            position: self.submit(text)
+            for position, (text, vector) in enumerate(zip(texts, cached))
+            if vector is None
+        }
+        return [
+            futures[position].result(timeout=self.timeout) if position in futures else cached[position].tolist()
+            for position in range(len(texts))
+        ]
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise Exception("Query embedding service is closed.")
+            self._queue.put((text, future))
+        return future
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout=5)
+        self._fail_pending(Exception("Query embedding service closed before the query was embedded."))
+        if self.batches_run:
+            print(
+                f"📊 Query embedder: {self.texts_embedded} texts in {self.batches_run} batches "
+                f"(avg {self.texts_embedded / self.batches_run:.1f} per forward pass)."
+            )
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                self._queue.put(None)
+                return
+            if item is not None:
+                item[1].set_exception(error)
+
+    def _collect_batch(self, first_item) -> list:
+        batch = [first_item]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = self._collect_batch(item)
+
+            unique_texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = dict(zip(unique_texts, embed_text_queries(self.model, self.processor, unique_texts)))
+            except Exception as e:
+                print(f"❌ Batched query embedding failed for {len(unique_texts)} texts: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.texts_embedded += len(unique_texts)
+            for text, future in batch:
+                future.set_result(vectors[text])
+            if self.cache:
+                self.cache.put_many(unique_texts, [vectors[text] for text in unique_texts])
@@ -0,0 +1,151 @@
+import copy
+import torch
+import numpy as np
+from functools import cache
+from torch import nn
+
+from ..core.config import settings
+from ..core.model_loader import load_clip_model_and_processor
+
+TEXT_ENCODER_BACKENDS = ("torch", "torch_int8", "torch_compile", "onnx")
+
+PARITY_TEXTS = [
+    "elegant dress shoes for men",
+    "black leather jacket",
+    "summer floral midi dress with short sleeves",
+    "cozy oversized knit sweater in beige",
+    "slim fit blue denim jeans",
+    "white cotton t-shirt",
+    "red evening gown for a wedding",
+    "running shoes",
+]
+
+
+class CLIPTextTower(nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.text_model = model.text_model
+        self.text_projection = model.text_projection
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        pooled_output = self.text_model(input_ids=input_ids, attention_mask=attention_mask).pooler_output
+        return self.text_projection(pooled_output)
+
+
+class TorchTextEncoder:
+    def __init__(self, tower: nn.Module, config, device: torch.device, name: str):
+        self.tower = tower
+        self.config = config
+        self.device = device
+        self.name = name
+
+    def get_text_features(self, input_ids: torch.Tensor, attention_mask: torch.Tensor, **_) -> torch.Tensor:
+        with torch.no_grad():
+            return self.tower(input_ids, attention_mask)
+
+
+class OnnxTextEncoder:
+    def __init__(self, session, config, name: str):
+        self.session = session
+        self.config = config
+        self.device = torch.device("cpu")
+        self.name = name
+
+    def get_text_features(self, input_ids: torch.Tensor, attention_mask: torch.Tensor, **_) -> torch.Tensor:
+        outputs = self.session.run(
+            ["text_embeds"],
+            {
+                "input_ids": input_ids.cpu().numpy().astype(np.int64),
+                "attention_mask": attention_mask.cpu().numpy().astype(np.int64),
+            },
+        )
+        return torch.from_numpy(outputs[0])
+
+
+def _export_onnx(tower: nn.Module, processor):
+    settings.TEXT_ENCODER_ONNX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    sample = processor(text=PARITY_TEXTS[:2], return_tensors="pt", padding=True, truncation=True, max_length=77)
+    print(f"⏳ Exporting CLIP text tower to ONNX: {settings.TEXT_ENCODER_ONNX_PATH}...")
+    torch.onnx.export(
+        tower.cpu(),
+        (sample["input_ids"], sample["attention_mask"]),
+        str(settings.TEXT_ENCODER_ONNX_PATH),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["text_embeds"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "text_embeds": {0: "batch"},
+        },
+        opset_version=17,
+    )
+
+
+def _build_onnx_encoder(model, processor, name: str) -> OnnxTextEncoder:
+    import onnxruntime as ort
+
+    if not settings.TEXT_ENCODER_ONNX_PATH.exists():
+        _export_onnx(CLIPTextTower(copy.deepcopy(model)).eval(), processor)
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(
+        str(settings.TEXT_ENCODER_ONNX_PATH), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    return OnnxTextEncoder(session, model.config, name)
+
+
+def build_text_encoder(model, processor, backend: str):
+    name = f"{settings.IMAGE_TEXT_MODEL}:{backend}"
+    if backend == "torch":
+        return model
+    if backend == "onnx":
+        return _build_onnx_encoder(model, processor, name)
+
+    tower = CLIPTextTower(model).eval()
+    if backend == "torch_int8":
+        if model.device.type != "cpu":
+            raise Exception("Dynamic int8 quantization is only supported on CPU.")
+        tower = torch.ao.quantization.quantize_dynamic(copy.deepcopy(tower), {nn.Linear}, dtype=torch.qint8)
+    elif backend == "torch_compile":
+        tower = torch.compile(tower, dynamic=True)
+    else:
+        raise ValueError(f"Unknown text encoder backend '{backend}'. Expected one of {TEXT_ENCODER_BACKENDS}.")
+    return TorchTextEncoder(tower, model.config, model.device, name)
+
+
+def _encode(encoder, processor, texts: list[str]) -> np.ndarray:
+    inputs = processor(text=texts, return_tensors="pt", padding=True, truncation=True, max_length=77).to(encoder.device)
+    with torch.no_grad():
+        embeddings = encoder.get_text_features(**inputs).float()
+    embeddings /= embeddings.norm(dim=-1, keepdim=True)
+    return embeddings.cpu().numpy()
+
+
+def check_parity(reference, candidate, processor, texts: list[str] = PARITY_TEXTS) -> float:
+    agreement = np.sum(_encode(reference, processor, texts) * _encode(candidate, processor, texts), axis=1)
+    return float(agreement.min())
+
+
+@cache
+def load_text_encoder(backend: str = settings.TEXT_ENCODER_BACKEND):
+    model, processor = load_clip_model_and_processor()
+    if backend == "torch":
+        return model, processor
+
+    try:
+        encoder = build_text_encoder(model, processor, backend)
+        min_cosine = check_parity(model, encoder, processor)
+    except Exception as e:
+        print(f"⚠️ Text encoder backend '{backend}' unavailable ({e}); using the reference model.")
+        return model, processor
+
+    if min_cosine < settings.TEXT_ENCODER_MIN_COSINE:
+        print(
+            f"⚠️ Text encoder backend '{backend}' failed the parity check "
+            f"(min cosine {min_cosine:.4f} < {settings.TEXT_ENCODER_MIN_COSINE}); using the reference model."
+        )
+        return model, processor
+
+    print(f"✅ Text encoder backend '{backend}' ready (min cosine vs reference: {min_cosine:.4f}).")
+    return encoder, processor
@@ -7,9 +7,17 @@ from pymilvus import (
     utility,
 )
 from yaspin import yaspin
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
+import time
 import pandas as pd
 import numpy as np
 
+from ..core.config import settings
+from ..data_handling.manifest import ManifestStore, fingerprint_records
+from ..vector_index.filter_expression import parse_filter_expression
+from ..vector_index.partitioning import PartitionRouter, partition_name_for
+
 class VectorDBClient:
 
     SCHEMA_FIELDS = [
@@ -21,12 +29,26 @@ class VectorDBClient:
         FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=512), 
     ]
 
-    def __init__(self, host: str, port: str | int):
+    def __init__(
+        self,
+        host: str,
+        port: str | int,
+        index_type: str = settings.MILVUS_INDEX_TYPE,
+        index_params: dict = settings.MILVUS_INDEX_PARAMS,
+        search_params: dict = settings.MILVUS_SEARCH_PARAMS,
+    ):
         self.host = host
         self.port = port
         self.collection = None
+        self.active_collection_name = None
+        self.set_index_config(index_type, index_params, search_params)
         self.field_names = [field.name for field in self.SCHEMA_FIELDS]
         self.scalar_field_names = [field.name for field in self.SCHEMA_FIELDS if field.name != "embedding"]
+        self.partition_field = settings.PARTITION_KEY_FIELD or None
+        self.partition_probes = settings.PARTITION_ROUTING_PROBES
+        self.router: PartitionRouter | None = None
+        if self.partition_field and self.partition_field not in self.scalar_field_names:
+            raise ValueError(f"Partition key '{self.partition_field}' is not a scalar field of the schema.")
         self._connect()
 
     def _connect(self):
@@ -41,71 +63,327 @@ class VectorDBClient:
         if recreate and utility.has_collection(name):
             print(f"🗑️ Dropping existing collection: {name}")
             Collection(name).drop()
-        if not utility.has_collection(name):
+        if not utility.has_collection(name) and self.resolve_alias(name) is None:
             self._create_collection_schema(name)
         self.collection = Collection(name)
-        print(f"✅ Collection '{name}' is ready.")
+        self.active_collection_name = self._physical_name(name)
+        self.router = None if recreate else self._load_router(self.active_collection_name)
+        print(f"✅ Collection '{name}' is ready (serving '{self.active_collection_name}').")
+
+    def current_version(self) -> str | None:
+        if not self.collection:
+            return None
+        physical_name = self._physical_name(self.collection.name)
+        if physical_name != self.active_collection_name:
+            self.active_collection_name = physical_name
+            self.router = self._load_router(physical_name)
+        return self.active_collection_name
+
+    def resolve_alias(self, alias: str) -> str | None:
+        for name in self.list_versions(alias):
+            if alias in utility.list_aliases(name):
+                return name
+        return None
+
+    def _physical_name(self, name: str) -> str:
+        return self.resolve_alias(name) or name
+
+    @staticmethod
+    def list_versions(alias: str) -> list[str]:
+        return sorted(name for name in utility.list_collections() if name.startswith(f"{alias}_v"))
+
+    @staticmethod
+    def _router_path(name: str):
+        return settings.DATA_DIR / f"partition_centroids_{name}.npz"
+
+    def _load_router(self, name: str) -> PartitionRouter | None:
+        if not self.partition_field:
+            return None
+        router = PartitionRouter.load(self._router_path(name))
+        if router is None or router.field != self.partition_field:
+            return None
+        print(f"  - Routing across {len(router.names)} '{router.field}' partitions.")
+        return router
+
+    def rebuild_collection(self, alias: str, data_df: pd.DataFrame, embeddings: np.ndarray, keep_versions: int = settings.MILVUS_KEEP_VERSIONS) -> str:
+        now = time.time()
+        version_name = f"{alias}_v{time.strftime('%Y%m%d%H%M%S', time.localtime(now))}{int(now % 1 * 1e6):06d}"
+        if utility.has_collection(version_name):
+            raise Exception(f"Collection version '{version_name}' already exists; refusing to overwrite it.")
+        print(f"🏗️ Building new collection version '{version_name}' behind alias '{alias}'")
+
+        builder = copy.copy(self)
+        try:
+            builder.set_collection(version_name, recreate=True)
+            builder.insert(data_df, embeddings)
+            builder.create_index()
+            builder.search_batch([np.asarray(embeddings[0], dtype=np.float32).tolist()], top_k=1)
+        except Exception:
+            print(f"❌ Building '{version_name}' failed; dropping the partial collection.")
+            if utility.has_collection(version_name):
+                Collection(version_name).drop()
+            self._router_path(version_name).unlink(missing_ok=True)
+            raise
+        print(f"🔥 '{version_name}' is loaded and answered a warm-up query.")
+
+        self.promote(alias, version_name)
+        self._drop_old_versions(alias, keep_versions)
+        return version_name
+
+    def promote(self, alias: str, version_name: str):
+        current = self.resolve_alias(alias)
+        if current == version_name:
+            return
+
+        if current:
+            utility.alter_alias(version_name, alias)
+        else:
+            if utility.has_collection(alias):
+                print(f"⚠️ Replacing legacy collection '{alias}' with an alias (one-time migration).")
+                Collection(alias).drop()
+            utility.create_alias(version_name, alias)
+
+        self.collection = Collection(alias)
+        self.active_collection_name = version_name
+        self.router = self._load_router(version_name)
+        print(f"🔀 Alias '{alias}' now points to '{version_name}' (previous: {current or 'none'}).")
+
+        if current:
+            Collection(current).release()
+
+    def rollback(self, alias: str) -> str | None:
+        versions = self.list_versions(alias)
+        current = self.resolve_alias(alias)
+        if current not in versions or versions.index(current) == 0:
+            print(f"⚠️ No previous version of '{alias}' to roll back to.")
+            return None
+
+        previous = versions[versions.index(current) - 1]
+        Collection(previous).load()
+        self.promote(alias, previous)
+        return previous
+
+    def _drop_old_versions(self, alias: str, keep_versions: int):
+        current = self.resolve_alias(alias)
+        for name in self.list_versions(alias)[:-max(keep_versions, 1)]:
+            if name != current:
+                print(f"🗑️ Dropping old collection version: {name}")
+                Collection(name).drop()
+                self._router_path(name).unlink(missing_ok=True)
 
     def _create_collection_schema(self, name: str):
         schema = CollectionSchema(self.SCHEMA_FIELDS, description="Fashion articles with hybrid search metadata")
         self.collection = Collection(name, schema)
         print(f"  - Created collection '{name}' from the central schema definition.")
 
-    def insert(self, data_df: pd.DataFrame, embeddings: np.ndarray, batch_size: int = 1000):
+    def _columnar_fields(self, data_df: pd.DataFrame) -> dict[str, np.ndarray]:
+        return {
+            field_name: data_df[field_name].fillna("").astype(str).to_numpy()
+            for field_name in self.scalar_field_names
+        }
+
+    def _plan_batches(self, columns: dict[str, np.ndarray], batch_size: int) -> list[tuple[str | None, np.ndarray]]:
+        if not self.partition_field:
+            row_groups = {None: np.arange(len(columns["article_id"]))}
+        else:
+            codes, values = pd.factorize(columns[self.partition_field])
+            row_groups = {value: np.flatnonzero(codes == code) for code, value in enumerate(values)}
+
+        batches = []
+        for value, rows in row_groups.items():
+            partition_name = partition_name_for(value) if self.partition_field else None
+            if partition_name and not self.collection.has_partition(partition_name):
+                self.collection.create_partition(partition_name)
+            batches.extend((partition_name, rows[start:start + batch_size]) for start in range(0, len(rows), batch_size))
+        return batches
+
+    def _insert_batch(self, columns: dict[str, np.ndarray], embeddings: np.ndarray, partition_name: str | None, rows: np.ndarray) -> int:
+        batch_data = [
+            np.asarray(embeddings[rows], dtype=np.float32) if field_name == "embedding" else columns[field_name][rows].tolist()
+            for field_name in self.field_names
+        ]
+        self.collection.insert(batch_data, partition_name=partition_name)
+        return len(rows)
+
+    def insert(
+        self,
+        data_df: pd.DataFrame,
+        embeddings: np.ndarray,
+        batch_size: int = settings.MILVUS_INSERT_BATCH_SIZE,
+        update_router: bool = True,
+        max_workers: int = settings.MILVUS_INSERT_WORKERS,
+    ):
         if not self.collection:
             raise Exception("Collection not set.")
-        
-        data_df['embedding'] = list(embeddings)
+
+        data_df = data_df.reset_index(drop=True)
+        columns = self._columnar_fields(data_df)
         total = len(data_df)
 
         with yaspin(text="Starting insertion...", color="yellow") as spinner:
-            for start in range(0, total, batch_size):
-                end = min(start + batch_size, total)
-                batch_df = data_df.iloc[start:end]
-                
-                batch_data = [list(batch_df[field_name]) for field_name in self.field_names]
-                
-                spinner.text = f"➡️ Inserting batch {start:>6}–{end:<6} of {total}"
-                self.collection.insert(batch_data)
-                
+            batches = self._plan_batches(columns, batch_size)
+            start_time = time.perf_counter()
+            inserted = 0
+
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                futures = [
+                    pool.submit(self._insert_batch, columns, embeddings, partition_name, rows)
+                    for partition_name, rows in batches
+                ]
+                for future in as_completed(futures):
+                    inserted += future.result()
+                    rate = inserted / max(time.perf_counter() - start_time, 1e-9)
+                    spinner.text = f"➡️ Inserted {inserted:>7} of {total} rows ({rate:,.0f} rows/s, {max_workers} workers)"
+
             spinner.text = "⏳ Flushing data to Milvus..."
             self.collection.flush()
+            elapsed = time.perf_counter() - start_time
             spinner.ok("✅")
             spinner.text = f"Insertion and flush complete for {total} items."
 
+        print(f"📈 Inserted {total} rows in {len(batches)} batches: {elapsed:.1f}s, {total / max(elapsed, 1e-9):,.0f} rows/s including flush.")
+
+        if update_router:
+            self._update_router(data_df, embeddings)
+
+    def _update_router(self, data_df: pd.DataFrame, embeddings: np.ndarray):
+        if not self.partition_field:
+            return
+        partition_values = data_df[self.partition_field].fillna("").astype(str).to_numpy()
+        self.router = PartitionRouter.build(self.partition_field, partition_values, np.asarray(embeddings, dtype=np.float32))
+        self.router.save(self._router_path(self._physical_name(self.collection.name)))
+        print(f"🧭 Saved centroids for {len(self.router.names)} '{self.partition_field}' partitions.")
+
+    def _delete_ids(self, article_ids: list[str], batch_size: int = 1000):
+        for start in range(0, len(article_ids), batch_size):
+            id_list = ", ".join(f'"{aid}"' for aid in article_ids[start:start + batch_size])
+            self.collection.delete(expr=f"article_id in [{id_list}]")
+
+    def sync(
+        self,
+        data_df: pd.DataFrame,
+        embeddings: np.ndarray,
+        manifest: ManifestStore,
+        batch_size: int = settings.MILVUS_INSERT_BATCH_SIZE,
+    ) -> dict:
+        if not self.collection:
+            raise Exception("Collection not set.")
+
+        data_df = data_df.reset_index(drop=True)
+        article_ids = data_df["article_id"].astype(str).tolist()
+        fingerprints = fingerprint_records(data_df, self.scalar_field_names, embeddings)
+        previous = manifest.fingerprints()
+        if previous and self.collection.num_entities == 0:
+            print("⚠️ Collection is empty but the sync manifest is not; re-inserting everything.")
+            previous = {}
+
+        changed_rows = [i for i, (aid, fp) in enumerate(zip(article_ids, fingerprints)) if previous.get(aid) != fp]
+        removed_ids = sorted(set(previous) - set(article_ids))
+        changed_ids = [article_ids[i] for i in changed_rows]
+        print(f"🔁 Incremental sync: {len(changed_rows)} new/changed, {len(removed_ids)} removed, {len(article_ids) - len(changed_rows)} unchanged.")
+
+        stale_ids = [aid for aid in changed_ids if aid in previous] + removed_ids
+        if stale_ids:
+            self._delete_ids(stale_ids)
+        if changed_rows:
+            self.insert(data_df.iloc[changed_rows], embeddings[changed_rows], batch_size=batch_size, update_router=False)
+        elif stale_ids:
+            self.collection.flush()
+
+        if changed_rows or removed_ids:
+            self._update_router(data_df, embeddings)
+            manifest.upsert_many((article_ids[i], fingerprints[i], None) for i in changed_rows)
+            manifest.delete_many(removed_ids)
+        if not self.collection.has_index():
+            self.create_index()
+
+        return {"upserted_count": len(changed_rows), "deleted_count": len(removed_ids)}
+
+    def set_index_config(self, index_type: str, index_params: dict, search_params: dict):
+        self.index_type = index_type
+        self.index_params = dict(index_params)
+        self.search_params = dict(search_params)
+
     def create_index(self):
         if not self.collection:
             raise Exception("Collection not set.")
 
-        vector_index_params = {"metric_type": "COSINE", "index_type": "IVF_FLAT", "params": {"nlist": 256}}
+        vector_index_params = {"metric_type": "COSINE", "index_type": self.index_type, "params": self.index_params}
+        print(f"🧱 Building {self.index_type} index with params {self.index_params}")
         self.collection.create_index(field_name="embedding", index_params=vector_index_params)
 
         for field_name in self.scalar_field_names:
             if not self.collection.has_index(index_name=f"idx_{field_name}") and field_name != "article_id":
-                self.collection.create_index(field_name=field_name, index_name=f"idx_{field_name}")
+                self.collection.create_index(
+                    field_name=field_name,
+                    index_name=f"idx_{field_name}",
+                    index_params={"index_type": settings.MILVUS_SCALAR_INDEX_TYPE},
+                )
 
         self.collection.load()
 
-    def search(self, vectors: list[list[float]], top_k: int, filter_expression: str = None) -> list[dict]:
+    def _entity_to_hit(self, hit) -> dict:
+        entity_data = {field: hit.entity.get(field) for field in self.scalar_field_names}
+        entity_data['score'] = hit.distance
+        return entity_data
+
+    def _route_partitions(self, expression: str | None, vectors: list[list[float]]) -> list[str] | None:
+        if self.router is None:
+            return None
+
+        try:
+            filters = parse_filter_expression(expression)
+        except ValueError:
+            filters = {}
+
+        if partition_name := self.router.partition_for_filters(filters):
+            return [partition_name] if partition_name in self.router.names else []
+        if self.partition_probes > 0:
+            return self.router.route(np.asarray(vectors, dtype=np.float32), self.partition_probes)
+        return None
+
+    def search_batch(
+        self,
+        vectors: list[list[float]],
+        top_k: int | list[int],
+        filter_expressions: str | list[str | None] | None = None,
+    ) -> list[list[dict]]:
         if not self.collection:
             raise Exception("Collection not set.")
 
-        search_params = {"metric_type": "COSINE", "params": {"nprobe": 64}}
-        results = self.collection.search(
-            data=vectors,
-            anns_field="embedding",
-            param=search_params,
-            limit=top_k,
-            output_fields=self.scalar_field_names, 
-            expr=filter_expression,
-        )
-
-        hits = []
-        for hit in results[0]:
-            entity_data = {field: hit.entity.get(field) for field in self.scalar_field_names}
-            entity_data['score'] = hit.distance
-            hits.append(entity_data)
-        
+        top_ks = top_k if isinstance(top_k, list) else [top_k] * len(vectors)
+        expressions = filter_expressions if isinstance(filter_expressions, list) else [filter_expressions] * len(vectors)
+        if len(top_ks) != len(vectors) or len(expressions) != len(vectors):
+            raise ValueError("top_k and filter_expressions must match the number of query vectors.")
+
+        query_groups: dict[str | None, list[int]] = {}
+        for i, expression in enumerate(expressions):
+            query_groups.setdefault(expression or None, []).append(i)
+
+        search_params = {"metric_type": "COSINE", "params": self.search_params}
+        all_hits: list[list[dict]] = [[] for _ in vectors]
+        for expression, indices in query_groups.items():
+            partition_names = self._route_partitions(expression, [vectors[i] for i in indices])
+            if partition_names == []:
+                continue
+
+            results = self.collection.search(
+                data=[vectors[i] for i in indices],
+                anns_field="embedding",
+                param=search_params,
+                limit=max(top_ks[i] for i in indices),
+                output_fields=self.scalar_field_names,
+                expr=expression,
+                partition_names=partition_names,
+            )
+            for i, result in zip(indices, results):
+                all_hits[i] = [self._entity_to_hit(hit) for hit in list(result)[:top_ks[i]]]
+
+        return all_hits
+
+    def search(self, vectors: list[list[float]], top_k: int, filter_expression: str = None) -> list[dict]:
+        hits = self.search_batch(vectors[:1], top_k=top_k, filter_expressions=filter_expression)[0]
+
         print(f"✅ Search returned {len(hits)} results")
         if hits:
             print(f"  First result: article_id={hits[0]['article_id']}, score={hits[0]['score']}")
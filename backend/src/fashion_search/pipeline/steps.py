@@ -1,5 +1,3 @@
-import numpy as np
-import pandas as pd
 from typing import Dict, Any
 
 from ..core.config import settings
@@ -8,6 +6,10 @@ from ..preprocessing.cleanup import clean_csv
 from ..captioning.captioning_pipeline import CaptioningPipeline
 from ..embeddings.embedding_pipeline import EmbeddingPipeline
 from ..milvus_client.vector_db_client import VectorDBClient
+from ..data_handling.manifest import ManifestStore, fingerprint_records
+from ..data_handling.embedding_store import load_embeddings
+from ..data_handling.catalog import load_catalog
+from ..services.index_generation import IndexGeneration
 
 class CleanupStep(PipelineStep):
     def run(self) -> Dict[str, Any]:
@@ -32,27 +34,49 @@ class EmbeddingStep(PipelineStep):
         print("✅ Embedding generation complete.")
         return {"status": "OK", **embedding_results}
 
+def vector_db_manifest(db_client: VectorDBClient) -> ManifestStore:
+    return ManifestStore(settings.MANIFEST_DB_PATH, namespace=f"{type(db_client).__name__}:articles")
+
 class DbInsertionStep(PipelineStep):
-    def __init__(self, db_client: VectorDBClient):
+    def __init__(
+        self,
+        db_client: VectorDBClient,
+        incremental: bool = settings.DB_SYNC_MODE == "incremental",
+        index_generation: IndexGeneration | None = None,
+    ):
         self.db_client = db_client
+        self.incremental = incremental
+        self.index_generation = index_generation
 
     def run(self) -> Dict[str, Any]:
         print("🚀 [4/4] Starting DB Insertion...")
         try:
-            df = pd.read_csv(settings.COMPLETE_ARTICLES_CSV_PATH, dtype={'article_id': str})
-            embeddings_data = np.load(settings.EMBEDDING_SAVE_PATH, allow_pickle=True)
-            
-            embeddings = embeddings_data['embeddings']
-            article_ids = [str(aid) for aid in embeddings_data['article_ids']]
+            df = load_catalog(columns=self.db_client.scalar_field_names)
+            article_ids, embeddings = load_embeddings()
             
             df_filtered = df[df['article_id'].isin(article_ids)].set_index('article_id').loc[article_ids].reset_index()
+            manifest = vector_db_manifest(self.db_client)
+
+            if self.incremental and len(manifest) > 0:
+                self.db_client.set_collection("articles")
+                sync_stats = self.db_client.sync(df_filtered, embeddings, manifest)
+                if self.index_generation and (sync_stats["upserted_count"] or sync_stats["deleted_count"]):
+                    self.index_generation.bump()
+                print("✅ DB incremental sync complete.")
+                return {"status": "success", "mode": "incremental", **sync_stats}
+
+            if self.incremental:
+                print("⚠️ No sync manifest found; falling back to a full rebuild.")
+
+            version_name = self.db_client.rebuild_collection("articles", df_filtered, embeddings)
 
-            self.db_client.set_collection("articles", recreate=True)
-            self.db_client.insert(df_filtered, embeddings)
-            self.db_client.create_index()
+            fingerprints = fingerprint_records(df_filtered, self.db_client.scalar_field_names, embeddings)
+            manifest.replace_all((aid, fp, None) for aid, fp in zip(article_ids, fingerprints))
+            if self.index_generation:
+                self.index_generation.bump()
             
             print("✅ DB Insertion complete.")
-            return {"status": "success", "inserted_count": len(article_ids)}
+            return {"status": "success", "mode": "full", "inserted_count": len(article_ids), "collection_version": version_name}
         except Exception as e:
             print(f"--- ❌ DB Insertion Step Failed: {e} ---")
             return {"status": "failed", "error": str(e)}
\ No newline at end of file
@@ -1,40 +1,84 @@
 import os
+import time
 import pandas as pd
 from PIL import Image
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 from ..core.config import settings
+from ..data_handling.catalog import read_articles_csv, write_catalog
+from ..data_handling.image_cache import image_fingerprint
+from ..data_handling.manifest import ManifestStore
+
+VALID, CORRUPTED = "valid", "corrupted"
+
+
+def _verify_image(image_path: str) -> str:
+    try:
+        with Image.open(image_path) as img:
+            img.verify()
+        return VALID
+    except Exception:
+        return CORRUPTED
+
 
 def _validate_image_data(df: pd.DataFrame, image_base_dir: str) -> pd.DataFrame:
     print("Pre-filtering valid images...")
-    valid_rows = []
-    for _, row in tqdm(df.iterrows(), total=df.shape[0], desc="Checking images"):
-        article_id = row["article_id"]
-        padded_id = str(article_id).zfill(10)
-        subfolder = padded_id[:3]
-        image_path = os.path.join(image_base_dir, subfolder, f"{padded_id}.jpg")
-
-        if not os.path.exists(image_path):
-            continue
+    padded_ids = df["article_id"].astype(str).str.zfill(10).tolist()
+    image_paths = [os.path.join(image_base_dir, padded_id[:3], f"{padded_id}.jpg") for padded_id in padded_ids]
 
-        try:
-            with Image.open(image_path) as img:
-                img.verify()  
-            valid_rows.append(row)
-        except Exception:
-            print(f"⚠️ Corrupted image found and skipped: {image_path}")
-            try:
-                os.remove(image_path)
-            except OSError as e:
-                print(f"❌ Could not delete {image_path}: {e}")
+    manifest = ManifestStore(settings.MANIFEST_DB_PATH, "image_validation")
+    previous = manifest.entries()
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=settings.IMAGE_VALIDATION_WORKERS) as pool:
+        fingerprints = list(pool.map(image_fingerprint, image_paths))
+
+        verdicts = {}
+        to_verify = []
+        for padded_id, fingerprint in zip(padded_ids, fingerprints):
+            if not fingerprint:
+                continue
+            cached_fingerprint, cached_verdict = previous.get(padded_id, (None, None))
+            if cached_fingerprint == fingerprint:
+                verdicts[padded_id] = cached_verdict
+            else:
+                to_verify.append(padded_id)
+
+        paths_by_id = dict(zip(padded_ids, image_paths))
+        results = pool.map(_verify_image, [paths_by_id[padded_id] for padded_id in to_verify])
+        for padded_id, verdict in tqdm(zip(to_verify, results), total=len(to_verify), desc="Checking images"):
+            verdicts[padded_id] = verdict
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+
+    fingerprint_by_id = dict(zip(padded_ids, fingerprints))
+    for padded_id, verdict in verdicts.items():
+        if verdict != CORRUPTED:
             continue
-            
-    print(f"Found {len(valid_rows)} valid images out of {len(df)}")
-    return pd.DataFrame(valid_rows)
+        image_path = paths_by_id[padded_id]
+        print(f"⚠️ Corrupted image found and skipped: {image_path}")
+        try:
+            os.remove(image_path)
+            fingerprint_by_id[padded_id] = ""
+        except OSError as e:
+            print(f"❌ Could not delete {image_path}: {e}")
+
+    manifest.replace_all(
+        (padded_id, fingerprint_by_id[padded_id], verdict)
+        for padded_id, verdict in verdicts.items()
+        if fingerprint_by_id[padded_id]
+    )
+
+    valid_mask = [verdicts.get(padded_id) == VALID for padded_id in padded_ids]
+    filtered_df = df[valid_mask]
+    print(f"   - Verified {len(to_verify)} new or changed images at {len(to_verify) / elapsed:.1f} images/sec "
+          f"({len(verdicts) - len(to_verify)} unchanged since the last run)")
+    print(f"Found {len(filtered_df)} valid images out of {len(df)}")
+    return filtered_df
 
 
 def clean_csv():
     try:
-        df = pd.read_csv(settings.ARTICLES_CSV_PATH)
+        df = read_articles_csv(settings.ARTICLES_CSV_PATH)
         print(f"📄 Loaded {len(df)} articles")
     except FileNotFoundError:
         print(f"❌ Error: CSV file not found at {settings.ARTICLES_CSV_PATH}")
@@ -43,7 +87,7 @@ def clean_csv():
     filtered_df = _validate_image_data(df, settings.IMAGE_BASE_DIR)
 
     if not filtered_df.empty:
-        filtered_df.to_csv(settings.COMPLETE_ARTICLES_CSV_PATH, index=False)
-        print(f"📁 Saved filtered CSV to {settings.COMPLETE_ARTICLES_CSV_PATH}")
+        write_catalog(filtered_df)
+        print(f"📁 Saved filtered catalog to {settings.COMPLETE_ARTICLES_CSV_PATH} and {settings.CATALOG_PARQUET_PATH}")
 
     return filtered_df, len(filtered_df)
\ No newline at end of file
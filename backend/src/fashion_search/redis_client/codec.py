@@ -0,0 +1,109 @@
+import json
+import importlib
+from functools import cache
+from typing import Any, Callable
+
+from ..core.config import settings
+
+HEADER_MAGIC = 0xFE
+FORMAT_VERSION = 1
+SERIALIZER_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSOR_IDS = {"none": 0, "zstd": 1, "lz4": 2}
+SERIALIZER_NAMES = {value: name for name, value in SERIALIZER_IDS.items()}
+COMPRESSOR_NAMES = {value: name for name, value in COMPRESSOR_IDS.items()}
+
+
+@cache
+def _serializer(name: str) -> tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if name == "json":
+        return (
+            lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+            json.loads,
+        )
+    if name == "orjson":
+        orjson = importlib.import_module("orjson")
+        return lambda obj: orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), orjson.loads
+    if name == "msgpack":
+        msgpack = importlib.import_module("msgpack")
+        return lambda obj: msgpack.packb(obj, use_bin_type=True), lambda raw: msgpack.unpackb(raw, raw=False)
+    raise ValueError(f"Unknown serializer '{name}'. Available: {list(SERIALIZER_IDS)}")
+
+
+@cache
+def _compressor(name: str) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if name == "none":
+        return bytes, bytes
+    if name == "zstd":
+        zstandard = importlib.import_module("zstandard")
+        return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+    if name == "lz4":
+        lz4_frame = importlib.import_module("lz4.frame")
+        return lz4_frame.compress, lz4_frame.decompress
+    raise ValueError(f"Unknown compression '{name}'. Available: {list(COMPRESSOR_IDS)}")
+
+
+def _json_loads(raw: bytes) -> Any:
+    try:
+        return _serializer("orjson")[1](raw)
+    except ImportError:
+        return json.loads(raw)
+
+
+def _with_fallback(loader: Callable[[str], Any], name: str, fallback: str) -> str:
+    try:
+        loader(name)
+        return name
+    except ImportError as e:
+        print(f"⚠️ '{name}' is not installed ({e}). Falling back to '{fallback}'.")
+        return fallback
+
+
+class PayloadCodec:
+    def __init__(
+        self,
+        serializer: str = settings.REDIS_SERIALIZER,
+        compression: str = settings.REDIS_COMPRESSION,
+        compression_threshold: int = settings.REDIS_COMPRESSION_THRESHOLD,
+    ):
+        self.serializer = _with_fallback(_serializer, serializer, "json")
+        self.compression = _with_fallback(_compressor, compression, "none")
+        self.compression_threshold = compression_threshold
+
+    @property
+    def tag(self) -> str:
+        return f"v{FORMAT_VERSION}.{self.serializer}.{self.compression}"
+
+    @property
+    def accepts_json(self) -> bool:
+        return self.serializer in ("json", "orjson")
+
+    def encode(self, obj: Any) -> bytes:
+        return self._frame(self.serializer, _serializer(self.serializer)[0](obj))
+
+    def encode_json(self, payload: bytes) -> bytes:
+        if not self.accepts_json:
+            return self.encode(_json_loads(payload))
+        return self._frame("json", payload)
+
+    def _frame(self, serializer: str, payload: bytes) -> bytes:
+        compression = self.compression if len(payload) >= self.compression_threshold else "none"
+        if compression != "none":
+            payload = _compressor(compression)[0](payload)
+        header = bytes([HEADER_MAGIC, FORMAT_VERSION, SERIALIZER_IDS[serializer], COMPRESSOR_IDS[compression]])
+        return header + payload
+
+    def decode(self, raw: bytes) -> Any:
+        if not raw or raw[0] != HEADER_MAGIC:
+            return _json_loads(raw)
+
+        version, serializer, compression = raw[1], SERIALIZER_NAMES.get(raw[2]), COMPRESSOR_NAMES.get(raw[3])
+        if version != FORMAT_VERSION or serializer is None or compression is None:
+            raise ValueError(f"Unsupported payload header {raw[:4].hex()}")
+
+        try:
+            payload = _compressor(compression)[1](raw[4:])
+        except Exception as e:
+            raise ValueError(f"Could not decompress {compression} payload: {e}") from e
+        if serializer in ("json", "orjson"):
+            return _json_loads(payload)
+        return _serializer(serializer)[1](payload)
@@ -1,27 +1,31 @@
 import redis
-import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from .codec import PayloadCodec
 
 
 class RedisDBClient:
-    def __init__(self, host: str = "localhost", port: int = 6379):
+    def __init__(self, host: str = "localhost", port: int = 6379, codec: PayloadCodec | None = None):
+        self.codec = codec or PayloadCodec()
         try:
             self.client = redis.Redis(host=host, port=port, decode_responses=True)
             self.client.ping()
+            self.binary_client = redis.Redis(host=host, port=port, decode_responses=False)
             print("✅ Successfully connected to Redis.")
         except redis.exceptions.ConnectionError as e:
             print(f"❌ Could not connect to Redis: {e}")
             self.client = None
+            self.binary_client = None
 
     def get_json(self, key: str) -> Optional[Dict[str, Any]]:
-        if not self.client:
+        if not self.binary_client:
             return None
 
         try:
-            json_string = self.client.get(key)
-            if json_string is None:
+            raw = self.binary_client.get(key)
+            if raw is None:
                 return None
-            return json.loads(json_string)
+            return self.codec.decode(raw)
         except redis.exceptions.RedisError as e:
             print(f"Error getting JSON from Redis for key '{key}': {e}")
             try:
@@ -32,18 +36,78 @@ class RedisDBClient:
             except redis.exceptions.RedisError as inner_e:
                 print(f"   - DEBUG: Could not check type of key '{key}': {inner_e}")
             return None
-        except json.JSONDecodeError:
-            print(f"Error: Data for key '{key}' is not valid JSON.")
+        except ValueError:
+            print(f"Error: Data for key '{key}' could not be decoded.")
             return None
 
+    def get_json_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        if not self.binary_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            raw_values = self.binary_client.mget(keys)
+        except redis.exceptions.RedisError as e:
+            print(f"Error getting {len(keys)} JSON values from Redis: {e}")
+            return [None] * len(keys)
+
+        values = []
+        for key, raw in zip(keys, raw_values):
+            try:
+                values.append(self.codec.decode(raw) if raw is not None else None)
+            except ValueError:
+                print(f"Error: Data for key '{key}' could not be decoded.")
+                values.append(None)
+        return values
+
     def set_json(self, key: str, data: Dict[str, Any], ttl: Optional[int] = None):
-        if not self.client:
+        if not self.binary_client:
             return
 
         try:
-            json_string = json.dumps(data)
-            self.client.set(key, json_string, ex=ttl)
+            self.binary_client.set(key, self.codec.encode(data), ex=ttl)
         except redis.exceptions.RedisError as e:
             print(f"Error setting data in Redis for key '{key}': {e}")
         except TypeError:
             print(f"Error: Data for key '{key}' is not JSON serializable.")
+
+    def get_value(self, key: str) -> Optional[str]:
+        if not self.client:
+            return None
+
+        try:
+            return self.client.get(key)
+        except redis.exceptions.RedisError as e:
+            print(f"Error getting value from Redis for key '{key}': {e}")
+            return None
+
+    def increment(self, key: str) -> Optional[int]:
+        if not self.client:
+            return None
+
+        try:
+            return self.client.incr(key)
+        except redis.exceptions.RedisError as e:
+            print(f"Error incrementing Redis key '{key}': {e}")
+            return None
+
+    def get_bytes_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not self.binary_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            return self.binary_client.mget(keys)
+        except redis.exceptions.RedisError as e:
+            print(f"Error getting {len(keys)} binary values from Redis: {e}")
+            return [None] * len(keys)
+
+    def set_bytes_many(self, values: Dict[str, bytes], ttl: Optional[int] = None):
+        if not self.binary_client or not values:
+            return
+
+        try:
+            pipe = self.binary_client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.set(key, value, ex=ttl)
+            pipe.execute()
+        except redis.exceptions.RedisError as e:
+            print(f"Error setting {len(values)} binary values in Redis: {e}")
@@ -21,4 +21,8 @@ class PipelineOptions(BaseModel):
     run_db_insertion: bool = Field(
         default=False, 
         description="Insert the generated embeddings into the Milvus vector database."
-    )
\ No newline at end of file
+    )
+    incremental_db_insertion: bool = Field(
+        default=False,
+        description="Sync only new, changed or removed articles into the vector database instead of rebuilding it."
+    )
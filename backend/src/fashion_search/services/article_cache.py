@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+from ..core.config import settings
+from ..redis_client.redis_db_client import RedisDBClient
+from .index_generation import IndexGeneration
+
+ARTICLE_DISPLAY_FIELDS = [
+    "article_id",
+    "prod_name",
+    "product_type_name",
+    "product_group_name",
+    "colour_group_name",
+    "index_name",
+]
+
+
+def article_key(article_id: str) -> str:
+    return f"article:{str(article_id).zfill(10)}"
+
+
+class ArticleCache:
+    def __init__(
+        self,
+        redis_client: RedisDBClient,
+        index_generation: IndexGeneration | None = None,
+        max_entries: int = settings.ARTICLE_CACHE_SIZE,
+    ):
+        self.redis_client = redis_client
+        self.index_generation = index_generation
+        self.max_entries = max_entries
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._generation: str | None = None
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_generation(self, generation: str | None):
+        if generation is not None and generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get_many(self, article_ids: list[str]) -> list[Dict[str, Any] | None]:
+        keys = [article_key(article_id) for article_id in article_ids]
+        results: list[Dict[str, Any] | None] = [None] * len(keys)
+        remote_positions = []
+
+        generation = self.index_generation.current() if self.index_generation else None
+        with self._lock:
+            self._check_generation(generation)
+            for position, key in enumerate(keys):
+                if (record := self._entries.get(key)) is not None:
+                    self._entries.move_to_end(key)
+                    results[position] = dict(record)
+                    self.local_hits += 1
+                else:
+                    remote_positions.append(position)
+
+        if remote_positions:
+            remote_keys = list(dict.fromkeys(keys[position] for position in remote_positions))
+            fetched = {
+                key: record
+                for key, record in zip(remote_keys, self.redis_client.get_json_many(remote_keys))
+                if record is not None
+            }
+            with self._lock:
+                for key, record in fetched.items():
+                    self._entries[key] = record
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                for position in remote_positions:
+                    if (record := fetched.get(keys[position])) is not None:
+                        results[position] = dict(record)
+                        self.redis_hits += 1
+                    else:
+                        self.misses += 1
+
+        return results
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,39 @@
+import time
+from ..core.config import settings
+from ..redis_client.redis_db_client import RedisDBClient
+from ..milvus_client.vector_db_client import VectorDBClient
+
+REVISION_KEY = "index:revision"
+
+
+class IndexGeneration:
+    def __init__(
+        self,
+        redis_client: RedisDBClient,
+        db_client: VectorDBClient,
+        ttl_seconds: float = settings.INDEX_GENERATION_TTL_SECONDS,
+    ):
+        self.redis_client = redis_client
+        self.db_client = db_client
+        self.ttl_seconds = ttl_seconds
+        self._cached: str | None = None
+        self._cached_at = 0.0
+
+    def current(self) -> str:
+        now = time.monotonic()
+        if self._cached is None or now - self._cached_at > self.ttl_seconds:
+            version = self.db_client.current_version() or "unversioned"
+            revision = self.redis_client.get_value(REVISION_KEY) or "0"
+            self._cached = f"{version}.{revision}"
+            self._cached_at = now
+        return self._cached
+
+    def bump(self) -> str:
+        self.redis_client.increment(REVISION_KEY)
+        self._cached = None
+        generation = self.current()
+        print(f"🏷️ Result caches now keyed on index generation '{generation}'.")
+        return generation
+
+    def cache_key(self, namespace: str, query: str) -> str:
+        return f"cache:{namespace}:{self.current()}:{query}"
@@ -2,7 +2,8 @@ from typing import Dict, Any
 from ..redis_client.redis_db_client import RedisDBClient
 from ..milvus_client.vector_db_client import VectorDBClient
 from ..llm.query_enhancer import LLMQueryEnhancer
-from ..embeddings.embedding_utils import embed_text_query
+from .index_generation import IndexGeneration
+from ..embeddings.query_embedding_service import QueryEmbeddingService
 
 class RedisSearchService:
     def __init__(
@@ -12,15 +13,19 @@ class RedisSearchService:
         llm_enhancer: LLMQueryEnhancer,
         model,
         processor,
+        index_generation: IndexGeneration | None = None,
+        embedder: QueryEmbeddingService | None = None,
     ):
         self.redis_client = redis_client
         self.milvus = db_client
         self.llm = llm_enhancer
         self.model = model
         self.processor = processor
+        self.index_generation = index_generation or IndexGeneration(redis_client, db_client)
+        self.embedder = embedder or QueryEmbeddingService(model, processor)
 
     def search(self, query: str, top_k: int) -> Dict[str, Any]:
-        cache_key = f"cache:query:{query}"
+        cache_key = self.index_generation.cache_key("query", query)
 
         cached_data = self.redis_client.get_json(cache_key)
         if cached_data:
@@ -35,10 +40,7 @@ class RedisSearchService:
         transformed_query = transformed_query.strip().strip('"').strip("'")
         summary = self.llm.summarize(transformed_query)
 
-        query_embedding = [
-            float(num)
-            for num in embed_text_query(self.model, self.processor, transformed_query)
-        ]
+        query_embedding = [float(num) for num in self.embedder.embed(transformed_query)]
 
         raw_milvus_hits = self.milvus.search([query_embedding], top_k=top_k)
 
@@ -54,9 +56,7 @@ class RedisSearchService:
     def search_baseline(self, query: str, top_k: int) -> Dict[str, Any]:
         print(f"Executing baseline search for query: '{query}'")
 
-        query_embedding = [
-            float(num) for num in embed_text_query(self.model, self.processor, query)
-        ]
+        query_embedding = [float(num) for num in self.embedder.embed(query)]
 
         raw_milvus_hits = self.milvus.search([query_embedding], top_k=top_k)
 
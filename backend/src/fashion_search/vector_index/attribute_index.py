@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+
+class BitmapAttributeIndex:
+    def __init__(self, columns: dict[str, np.ndarray], fields: list[str]):
+        self.num_rows = len(next(iter(columns.values()))) if columns else 0
+        self.bitmaps: dict[str, dict[str, np.ndarray]] = {}
+
+        for field in fields:
+            codes, uniques = pd.factorize(columns[field])
+            field_bitmaps = {}
+            for code, value in enumerate(uniques):
+                field_bitmaps[value] = np.packbits(codes == code)
+            self.bitmaps[field] = field_bitmaps
+
+    def has_field(self, field: str) -> bool:
+        return field in self.bitmaps
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bitmap.nbytes for field_bitmaps in self.bitmaps.values() for bitmap in field_bitmaps.values())
+
+    def candidate_rows(self, filters: dict[str, str]) -> np.ndarray:
+        combined = None
+        for field, value in filters.items():
+            bitmap = self.bitmaps[field].get(value)
+            if bitmap is None:
+                return np.empty(0, dtype=np.int64)
+            combined = bitmap.copy() if combined is None else np.bitwise_and(combined, bitmap, out=combined)
+
+        if combined is None:
+            return np.arange(self.num_rows)
+        return np.flatnonzero(np.unpackbits(combined, count=self.num_rows))
+
+    def rows_matching_any(self, field: str, values: list[str]) -> np.ndarray:
+        combined = np.zeros((self.num_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if (bitmap := self.bitmaps[field].get(value)) is not None:
+                np.bitwise_or(combined, bitmap, out=combined)
+        return np.flatnonzero(np.unpackbits(combined, count=self.num_rows))
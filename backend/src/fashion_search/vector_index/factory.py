@@ -0,0 +1,11 @@
+from ..core.config import settings
+from ..milvus_client.vector_db_client import VectorDBClient
+from .local_vector_client import LocalVectorClient
+
+
+def create_vector_client(backend: str = settings.VECTOR_SEARCH_BACKEND):
+    if backend == "milvus":
+        return VectorDBClient(host=settings.MILVUS_HOST, port=settings.MILVUS_PORT)
+    if backend == "local":
+        return LocalVectorClient()
+    raise ValueError(f"Unknown vector search backend: '{backend}' (expected 'milvus' or 'local')")
@@ -0,0 +1,18 @@
+import re
+
+_CLAUSE = r"(\w+)\s*==\s*'((?:[^'\\]|\\.)*)'"
+_CLAUSE_PATTERN = re.compile(_CLAUSE)
+_EXPRESSION_PATTERN = re.compile(rf"\s*{_CLAUSE}(?:\s+and\s+{_CLAUSE})*\s*")
+
+
+def parse_filter_expression(expression: str | None) -> dict[str, str]:
+    if not expression or not expression.strip():
+        return {}
+
+    if not _EXPRESSION_PATTERN.fullmatch(expression):
+        raise ValueError(f"Unsupported filter expression: {expression!r}")
+
+    return {
+        field: re.sub(r"\\(.)", r"\1", raw_value)
+        for field, raw_value in _CLAUSE_PATTERN.findall(expression)
+    }
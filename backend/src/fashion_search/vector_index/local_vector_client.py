@@ -0,0 +1,301 @@
+import os
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from ..core.config import settings
+from .attribute_index import BitmapAttributeIndex
+from .filter_expression import parse_filter_expression
+from .partitioning import PartitionRouter
+from .quantization import create_quantizer
+from ..data_handling.embedding_store import embeddings_source, load_embeddings
+from ..data_handling.catalog import load_catalog
+from ..data_handling.manifest import ManifestStore, fingerprint_records
+
+
+class LocalVectorClient:
+
+    SCALAR_FIELD_NAMES = [
+        "article_id",
+        "index_name",
+        "product_type_name",
+        "colour_group_name",
+        "graphical_appearance_name",
+    ]
+
+    def __init__(
+        self,
+        embeddings_path: Path = settings.EMBEDDING_SAVE_PATH,
+        articles_path: Path = settings.COMPLETE_ARTICLES_CSV_PATH,
+        compression: str = settings.VECTOR_INDEX_COMPRESSION,
+        rescore_factor: int = settings.VECTOR_RESCORE_FACTOR,
+    ):
+        self.embeddings_path = embeddings_path
+        self.articles_path = articles_path
+        self.compression = compression
+        self.rescore_factor = max(1, rescore_factor)
+        self.quantizer = None
+        self.partition_field = settings.PARTITION_KEY_FIELD or None
+        self.partition_probes = settings.PARTITION_ROUTING_PROBES
+        self.router: PartitionRouter | None = None
+        self.collection = None
+        self.scalar_field_names = list(self.SCALAR_FIELD_NAMES)
+        if self.partition_field and self.partition_field not in self.scalar_field_names:
+            raise ValueError(f"Partition key '{self.partition_field}' is not a scalar field of the schema.")
+        self.embeddings: np.ndarray | None = None
+        self.columns: dict[str, np.ndarray] = {}
+        self.attribute_index: BitmapAttributeIndex | None = None
+        self.active_collection_name = None
+        self._previous_state: dict | None = None
+
+    def set_collection(self, name: str, recreate: bool = False):
+        self.collection = name
+        if self.embeddings is None and not recreate:
+            self._load_from_disk()
+            source = embeddings_source(self.embeddings_path)
+            self.active_collection_name = f"{name}_v{int(os.path.getmtime(source))}"
+        print(f"✅ In-process collection '{name}' is ready.")
+
+    def current_version(self) -> str | None:
+        return self.active_collection_name
+
+    def _state(self) -> dict:
+        return {
+            name: getattr(self, name)
+            for name in ("embeddings", "columns", "attribute_index", "quantizer", "router", "active_collection_name")
+        }
+
+    def rebuild_collection(self, alias: str, data_df: pd.DataFrame, embeddings: np.ndarray, keep_versions: int = 2) -> str:
+        previous_state = self._state()
+        self.collection = alias
+        self._set_data(data_df.reset_index(drop=True), embeddings)
+        self.active_collection_name = f"{alias}_v{time.strftime('%Y%m%d%H%M%S')}"
+        self._previous_state = previous_state if keep_versions > 1 and previous_state["embeddings"] is not None else None
+        print(f"🔀 In-process collection '{alias}' now serves '{self.active_collection_name}'.")
+        return self.active_collection_name
+
+    def rollback(self, alias: str) -> str | None:
+        if self._previous_state is None:
+            print(f"⚠️ No previous version of '{alias}' to roll back to.")
+            return None
+        for name, value in self._previous_state.items():
+            setattr(self, name, value)
+        self._previous_state = None
+        print(f"🔀 In-process collection '{alias}' rolled back to '{self.active_collection_name}'.")
+        return self.active_collection_name
+
+    def _load_from_disk(self):
+        article_ids, embeddings = load_embeddings(self.embeddings_path)
+
+        df = load_catalog(columns=self.scalar_field_names, csv_path=self.articles_path)
+        df = df.drop_duplicates("article_id").set_index("article_id").reindex(article_ids).reset_index()
+
+        self._set_data(df, embeddings, from_disk=True)
+
+    def _set_data(self, data_df: pd.DataFrame, embeddings: np.ndarray, from_disk: bool = False):
+        embeddings = self._normalized(embeddings)
+        columns = {
+            field: data_df[field].fillna("").astype(str).to_numpy(dtype=object)
+            for field in self.scalar_field_names
+        }
+        attribute_index = BitmapAttributeIndex(columns, fields=[f for f in self.scalar_field_names if f != "article_id"])
+        print(f"🧮 Built bitmap indexes for {len(attribute_index.bitmaps)} attributes ({attribute_index.nbytes / 1e6:.1f} MB)")
+        if self.partition_field:
+            self.router = PartitionRouter.build(self.partition_field, columns[self.partition_field], embeddings)
+
+        if self.compression == "none":
+            self.quantizer, self.embeddings = None, embeddings
+            self.columns, self.attribute_index = columns, attribute_index
+        else:
+            quantizer = create_quantizer(self.compression, n_subvectors=settings.PQ_SUBVECTORS).fit(embeddings)
+            quantizer.encode(embeddings)
+            self.quantizer, self.embeddings = quantizer, self._spill_to_disk(embeddings, reuse_existing=from_disk)
+            self.columns, self.attribute_index = columns, attribute_index
+            print(
+                f"🗜️ Built {quantizer.name} codes: {quantizer.nbytes / 1e6:.1f} MB "
+                f"vs {embeddings.nbytes / 1e6:.1f} MB float32 ({embeddings.nbytes / quantizer.nbytes:.1f}x smaller)"
+            )
+            self.evaluate_recall(reference=embeddings)
+
+        print(f"✅ Loaded {len(self.embeddings)} vectors of dim {self.embeddings.shape[1]} in-process.")
+
+    @staticmethod
+    def _normalized(embeddings: np.ndarray) -> np.ndarray:
+        if isinstance(embeddings, np.memmap) and embeddings.dtype == np.float32:
+            norms = np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))
+            if np.allclose(norms, 1.0, atol=1e-3):
+                return embeddings
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def _spill_to_disk(self, embeddings: np.ndarray, reuse_existing: bool = False) -> np.ndarray:
+        if isinstance(embeddings, np.memmap):
+            return embeddings
+        rescore_path = self.embeddings_path.with_suffix(".rescore.npy")
+        if reuse_existing and self._rescore_is_current(rescore_path, embeddings):
+            return np.load(rescore_path, mmap_mode="r")
+        tmp_path = rescore_path.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp.npy")
+        try:
+            np.save(tmp_path, embeddings)
+            os.replace(tmp_path, rescore_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return np.load(rescore_path, mmap_mode="r")
+
+    def _rescore_is_current(self, rescore_path: Path, embeddings: np.ndarray) -> bool:
+        try:
+            if rescore_path.stat().st_mtime < os.path.getmtime(embeddings_source(self.embeddings_path)):
+                return False
+            existing = np.load(rescore_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return False
+        return existing.shape == embeddings.shape and existing.dtype == embeddings.dtype
+
+    def insert(self, data_df: pd.DataFrame, embeddings: np.ndarray, batch_size: int = 1000):
+        if not self.collection:
+            raise Exception("Collection not set.")
+        self._set_data(data_df.reset_index(drop=True), embeddings)
+
+    def sync(self, data_df: pd.DataFrame, embeddings: np.ndarray, manifest: ManifestStore, batch_size: int = 1000) -> dict:
+        if not self.collection:
+            raise Exception("Collection not set.")
+
+        data_df = data_df.reset_index(drop=True)
+        article_ids = data_df["article_id"].astype(str).tolist()
+        fingerprints = fingerprint_records(data_df, self.scalar_field_names, embeddings)
+        previous = manifest.fingerprints()
+
+        changed_rows = [i for i, (aid, fp) in enumerate(zip(article_ids, fingerprints)) if previous.get(aid) != fp]
+        removed_ids = sorted(set(previous) - set(article_ids))
+        print(f"🔁 Incremental sync: {len(changed_rows)} new/changed, {len(removed_ids)} removed, {len(article_ids) - len(changed_rows)} unchanged.")
+
+        if changed_rows or removed_ids or self.embeddings is None:
+            self._set_data(data_df, embeddings)
+        if changed_rows or removed_ids:
+            manifest.upsert_many((article_ids[i], fingerprints[i], None) for i in changed_rows)
+            manifest.delete_many(removed_ids)
+
+        return {"upserted_count": len(changed_rows), "deleted_count": len(removed_ids)}
+
+    def create_index(self):
+        if not self.collection:
+            raise Exception("Collection not set.")
+        print("✅ In-process search is exact; no index to build.")
+
+    def _candidate_rows(self, filter_expression: str | None) -> np.ndarray | None:
+        filters = parse_filter_expression(filter_expression)
+        if not filters:
+            return None
+
+        for field in filters:
+            if field not in self.columns:
+                raise ValueError(f"Cannot filter on unknown field '{field}'")
+
+        rows = self.attribute_index.candidate_rows(
+            {field: value for field, value in filters.items() if self.attribute_index.has_field(field)}
+        )
+        for field, value in filters.items():
+            if not self.attribute_index.has_field(field):
+                rows = rows[self.columns[field][rows] == value]
+        return rows
+
+    def _routed_rows(self, queries: np.ndarray) -> np.ndarray | None:
+        partition_names = set(self.router.route(queries, self.partition_probes))
+        if len(partition_names) == len(self.router.names):
+            return None
+        values = [value for value, name in zip(self.router.values, self.router.names) if name in partition_names]
+        return self.attribute_index.rows_matching_any(self.partition_field, values)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if top_k >= len(scores):
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        return top[np.argsort(-scores[top])]
+
+    def _rows_to_hits(self, rows: np.ndarray, scores: np.ndarray) -> list[dict]:
+        hits = []
+        for row, score in zip(rows, scores):
+            entity_data = {field: self.columns[field][row] for field in self.scalar_field_names}
+            entity_data["score"] = float(score)
+            hits.append(entity_data)
+        return hits
+
+    def search_batch(
+        self,
+        vectors: list[list[float]],
+        top_k: int | list[int],
+        filter_expressions: str | list[str | None] | None = None,
+    ) -> list[list[dict]]:
+        if not self.collection or self.embeddings is None:
+            raise Exception("Collection not set.")
+
+        top_ks = top_k if isinstance(top_k, list) else [top_k] * len(vectors)
+        expressions = filter_expressions if isinstance(filter_expressions, list) else [filter_expressions] * len(vectors)
+        if len(top_ks) != len(vectors) or len(expressions) != len(vectors):
+            raise ValueError("top_k and filter_expressions must match the number of query vectors.")
+
+        queries = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        query_groups: dict[str | None, list[int]] = {}
+        for i, expression in enumerate(expressions):
+            query_groups.setdefault(expression or None, []).append(i)
+
+        all_hits: list[list[dict]] = [[] for _ in vectors]
+        for expression, indices in query_groups.items():
+            rows = self._candidate_rows(expression)
+            if rows is None and self.router is not None and self.partition_probes > 0:
+                rows = self._routed_rows(queries[indices])
+            group_results = self._score_group(queries[indices], rows, [top_ks[i] for i in indices])
+            for i, (selected_rows, selected_scores) in zip(indices, group_results):
+                all_hits[i] = self._rows_to_hits(selected_rows, selected_scores)
+
+        return all_hits
+
+    def _score_group(self, queries: np.ndarray, rows: np.ndarray | None, top_ks: list[int]):
+        if self.quantizer is None:
+            candidates = self.embeddings if rows is None else self.embeddings[rows]
+            for scores, top_k in zip(queries @ candidates.T, top_ks):
+                order = self._top_k(scores, top_k)
+                yield (order if rows is None else rows[order]), scores[order]
+            return
+
+        approximate_scores = self.quantizer.score(queries, rows)
+        for query, scores, top_k in zip(queries, approximate_scores, top_ks):
+            shortlist = self._top_k(scores, top_k * self.rescore_factor)
+            shortlist_rows = shortlist if rows is None else rows[shortlist]
+            shortlist_rows = np.sort(shortlist_rows)
+            exact_scores = self.embeddings[shortlist_rows] @ query
+            order = self._top_k(exact_scores, top_k)
+            yield shortlist_rows[order], exact_scores[order]
+
+    def evaluate_recall(self, reference: np.ndarray, num_queries: int = 200, top_k: int = 10, seed: int = 0) -> float:
+        if self.quantizer is None:
+            return 1.0
+
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(len(reference), size=min(num_queries, len(reference)), replace=False)
+        queries = reference[sample]
+
+        matches = 0
+        for query, (approximate_rows, _) in zip(queries, self._score_group(queries, None, [top_k] * len(queries))):
+            exact_rows = self._top_k(reference @ query, top_k)
+            matches += len(np.intersect1d(exact_rows, approximate_rows))
+
+        recall = matches / (len(queries) * top_k)
+        print(f"📏 {self.quantizer.name} recall@{top_k} vs exact search: {recall:.4f} (rescore factor {self.rescore_factor})")
+        return recall
+
+    def search(self, vectors: list[list[float]], top_k: int, filter_expression: str = None) -> list[dict]:
+        hits = self.search_batch(vectors[:1], top_k=top_k, filter_expressions=filter_expression)[0]
+
+        print(f"✅ Search returned {len(hits)} results")
+        if hits:
+            print(f"  First result: article_id={hits[0]['article_id']}, score={hits[0]['score']}")
+        return hits
@@ -0,0 +1,49 @@
+import re
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+def partition_name_for(value: str) -> str:
+    slug = re.sub(r"[^0-9a-zA-Z]+", "_", str(value)).strip("_").lower()[:48] or "unknown"
+    digest = hashlib.md5(str(value).encode("utf-8")).hexdigest()[:6]
+    return f"p_{slug}_{digest}"
+
+
+class PartitionRouter:
+    def __init__(self, field: str, values: list[str], centroids: np.ndarray):
+        self.field = field
+        self.values = list(values)
+        self.names = [partition_name_for(value) for value in self.values]
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+
+    @classmethod
+    def build(cls, field: str, partition_values: np.ndarray, embeddings: np.ndarray) -> "PartitionRouter":
+        codes, uniques = pd.factorize(partition_values)
+        centroids = np.stack([embeddings[codes == code].mean(axis=0, dtype=np.float32) for code in range(len(uniques))]).astype(np.float32)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        return cls(field, [str(value) for value in uniques], centroids)
+
+    def save(self, path: Path):
+        np.savez(path, field=np.array(self.field), values=np.array(self.values), centroids=self.centroids)
+
+    @classmethod
+    def load(cls, path: Path) -> "PartitionRouter | None":
+        if not path.exists():
+            return None
+        data = np.load(path)
+        return cls(str(data["field"]), [str(value) for value in data["values"]], data["centroids"])
+
+    def partition_for_filters(self, filters: dict[str, str]) -> str | None:
+        if self.field not in filters:
+            return None
+        return partition_name_for(filters[self.field])
+
+    def route(self, queries: np.ndarray, n_probe: int) -> list[str]:
+        if n_probe <= 0 or n_probe >= len(self.names):
+            return list(self.names)
+
+        scores = np.asarray(queries, dtype=np.float32) @ self.centroids.T
+        nearest = np.argpartition(-scores, n_probe - 1, axis=1)[:, :n_probe]
+        return [self.names[i] for i in np.unique(nearest)]
@@ -0,0 +1,124 @@
+import numpy as np
+
+SCORING_CHUNK_ROWS = 65536
+
+
+def train_kmeans(data: np.ndarray, n_clusters: int, n_iter: int = 10, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    data = np.asarray(data, dtype=np.float32)
+    n_clusters = min(n_clusters, len(data))
+    centroids = data[rng.choice(len(data), size=n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        distances = (centroids ** 2).sum(axis=1) - 2.0 * data @ centroids.T
+        assignments = distances.argmin(axis=1)
+
+        counts = np.bincount(assignments, minlength=n_clusters)
+        sums = np.stack(
+            [np.bincount(assignments, weights=data[:, d], minlength=n_clusters) for d in range(data.shape[1])],
+            axis=1,
+        ).astype(np.float32)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+
+    return centroids
+
+
+class ScalarQuantizer:
+    name = "int8"
+
+    def __init__(self):
+        self.offset: np.ndarray | None = None
+        self.scale: np.ndarray | None = None
+        self.codes: np.ndarray | None = None
+
+    def fit(self, vectors: np.ndarray) -> "ScalarQuantizer":
+        low = vectors.min(axis=0)
+        high = vectors.max(axis=0)
+        self.offset = low.astype(np.float32)
+        self.scale = np.maximum((high - low) / 255.0, 1e-12).astype(np.float32)
+        return self
+
+    def encode(self, vectors: np.ndarray):
+        codes = np.rint((vectors - self.offset) / self.scale)
+        self.codes = np.clip(codes, 0, 255).astype(np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.offset.nbytes + self.scale.nbytes
+
+    def score(self, queries: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        codes = self.codes if rows is None else self.codes[rows]
+        scaled_queries = (queries * self.scale).T
+        bias = queries @ self.offset
+
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), SCORING_CHUNK_ROWS):
+            chunk = codes[start:start + SCORING_CHUNK_ROWS].astype(np.float32)
+            scores[:, start:start + len(chunk)] = (chunk @ scaled_queries).T
+        return scores + bias[:, None]
+
+
+class ProductQuantizer:
+    name = "pq"
+
+    def __init__(self, n_subvectors: int = 128, n_centroids: int = 256, train_sample: int = 10000, seed: int = 0):
+        self.n_subvectors = n_subvectors
+        self.n_centroids = n_centroids
+        self.train_sample = train_sample
+        self.seed = seed
+        self.codebooks: np.ndarray | None = None
+        self.codes: np.ndarray | None = None
+
+    def fit(self, vectors: np.ndarray) -> "ProductQuantizer":
+        dim = vectors.shape[1]
+        if dim % self.n_subvectors:
+            raise ValueError(f"Embedding dim {dim} is not divisible into {self.n_subvectors} subvectors.")
+
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(self.train_sample, len(vectors))
+        sample = vectors[np.sort(rng.choice(len(vectors), size=sample_size, replace=False))]
+        subspaces = sample.reshape(sample_size, self.n_subvectors, -1)
+
+        self.codebooks = np.stack([
+            train_kmeans(subspaces[:, m, :], self.n_centroids, seed=self.seed + m)
+            for m in range(self.n_subvectors)
+        ])
+        return self
+
+    def encode(self, vectors: np.ndarray):
+        codes = np.empty((len(vectors), self.n_subvectors), dtype=np.uint8)
+        for start in range(0, len(vectors), SCORING_CHUNK_ROWS):
+            chunk = vectors[start:start + SCORING_CHUNK_ROWS].reshape(-1, self.n_subvectors, self.codebooks.shape[2])
+            for m in range(self.n_subvectors):
+                distances = (
+                    -2.0 * chunk[:, m, :] @ self.codebooks[m].T
+                    + (self.codebooks[m] ** 2).sum(axis=1)
+                )
+                codes[start:start + len(chunk), m] = distances.argmin(axis=1)
+        self.codes = codes
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.codebooks.nbytes
+
+    def score(self, queries: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        codes = self.codes if rows is None else self.codes[rows]
+        query_subspaces = queries.reshape(len(queries), self.n_subvectors, -1)
+        lookup_tables = np.einsum("qmd,mcd->qmc", query_subspaces, self.codebooks)
+
+        scores = np.zeros((len(queries), len(codes)), dtype=np.float32)
+        for m in range(self.n_subvectors):
+            scores += lookup_tables[:, m, codes[:, m]]
+        return scores
+
+
+def create_quantizer(mode: str, n_subvectors: int = 128):
+    if mode == "int8":
+        return ScalarQuantizer()
+    if mode == "pq":
+        return ProductQuantizer(n_subvectors=n_subvectors)
+    raise ValueError(f"Unknown vector index compression: '{mode}' (expected 'none', 'int8' or 'pq')")